@@ -1,7 +1,20 @@
-from .analyzer import analyze_html, suggest_fixes_with_ai, summarize_issues
-from .auto_scanner import scan_site
-from .cli import main
-from .fixes import apply_fixes
+"""SiteAble accessibility package.
+
+Public names are resolved lazily (PEP 562) so that ``import ai.accessibility``
+does not pull in requests, lxml, openai or the CLI until they are used.
+"""
+import importlib
+from typing import Any
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "analyze_html": ".analyzer",
+    "summarize_issues": ".analyzer",
+    "suggest_fixes_with_ai": ".analyzer",
+    "apply_fixes": ".fixes",
+    "scan_site": ".auto_scanner",
+    "main": ".cli",
+}
 
 __all__ = [
     "analyze_html",
@@ -12,3 +25,16 @@ __all__ = [
     "main",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,7 @@
 """Version information for SiteAble."""
 
 __version__ = "1.0.0"
-__version_info__ = tuple(int(x) for x in __version__.split("."))
+__version_info__ = (1, 0, 0)  # keep in sync with __version__ (checked in tests)
 
 # Package metadata
 __title__ = "SiteAble"
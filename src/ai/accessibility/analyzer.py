@@ -1,102 +1,151 @@
 import os
-import re
-from typing import List, Dict, Any
+from collections import Counter
+from itertools import pairwise
+from typing import Any, Dict, Iterable, List, Optional
 
-from bs4 import BeautifulSoup
+from core.cache import LRUCache, content_digest
+from core.document import element_context, parse_document
 
 try:
     import openai
 except Exception:
     openai = None
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
-def analyze_html(html: str, exclude_analyzers: List[str] = None) -> List[Dict[str, Any]]:
-    """Analyze HTML using plugin-based analyzers.
-    
-    Falls back to the old implementation if analyzers are not available.
-    exclude_analyzers: list of analyzer names to skip
+# AI suggestions keyed on digest(model, prompt); identical prompts cost one call
+_AI_CACHE = LRUCache(maxsize=64)
+_AI_DISK_CACHE = None
+
+# Heading tag names; matching by name avoids a regex test per element
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+def _legacy_analyze_html(html: str) -> List[Dict[str, Any]]:
+    """Built-in checks used when the plugin analyzers cannot be loaded.
+
+    All checks share a single walk over the document, dispatching on tag name.
     """
-    try:
-        from .analyzer_plugin import analyze_html as plugin_analyze
-        return plugin_analyze(html, exclude_analyzers=exclude_analyzers)
-    except Exception:
-        # fallback to legacy implementation
-        soup = BeautifulSoup(html, "lxml")
-        issues: List[Dict[str, Any]] = []
+    doc = parse_document(html)
+    if doc is None:
+        return []
+
+    img_issues: List[Dict[str, Any]] = []
+    link_issues: List[Dict[str, Any]] = []
+    heading_issues: List[Dict[str, Any]] = []
+    form_issues: List[Dict[str, Any]] = []
+
+    headings: List[int] = []
+    labelled_ids = set()
+    # Controls whose only remaining way to be labelled is a label[for] that
+    # may appear later in the document
+    pending_controls = []
+
+    for el in doc.iter():
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
 
         # Images must have alt
-        for img in soup.find_all("img"):
-            alt = img.get("alt")
+        if tag == "img":
+            alt = el.get("alt")
             if not alt or not alt.strip():
-                issues.append({
+                img_issues.append({
                     "code": "IMG_MISSING_ALT",
                     "message": "Image element missing descriptive alt text.",
-                    "context": str(img)[:200],
+                    "context": element_context(el),
                 })
 
         # Links should have text or image with alt
-        for a in soup.find_all("a"):
-            text = a.get_text(strip=True)
+        elif tag == "a":
+            text = el.text_content().strip()
             if not text:
-                imgs = a.find_all("img")
+                imgs = el.xpath(".//img")
                 if imgs:
                     first_alt = imgs[0].get("alt") or ""
                     if not first_alt.strip():
-                        issues.append({
+                        link_issues.append({
                             "code": "LINK_IMG_MISSING_ALT",
                             "message": "Link contains image(s) without alt text.",
-                            "context": str(a)[:200],
+                            "context": element_context(el),
                         })
                 else:
-                    issues.append({
+                    link_issues.append({
                         "code": "LINK_NO_TEXT",
                         "message": "Link has no accessible name (no text and no labelled content).",
-                        "context": str(a)[:200],
+                        "context": element_context(el),
                     })
 
-        # Heading order (simple check for jumps)
-        headings = [int(tag.name[1]) for tag in soup.find_all(re.compile(r"^h[1-6]$"))]
-        if headings:
-            prev = headings[0]
-            for h in headings[1:]:
-                if h - prev > 1:
-                    issues.append({
-                        "code": "HEADING_ORDER",
-                        "message": "Heading level jumps (may confuse screen readers).",
-                        "context": f"sequence: {headings[:20]}",
-                    })
-                    break
-                prev = h
+        # Heading levels; order is checked once the walk is done
+        elif tag in _HEADING_TAGS:
+            headings.append(int(tag[1]))
+
+        elif tag == "label":
+            for_id = el.get("for")
+            if for_id:
+                labelled_ids.add(for_id)
 
         # Form controls should have labels or aria-labels
-        for control in soup.find_all(["input", "textarea", "select"]):
-            ctype = (control.get("type") or "").lower()
+        elif tag in ("input", "textarea", "select"):
+            ctype = (el.get("type") or "").lower()
             if ctype in ("hidden", "submit", "button", "image"):
                 continue
-            has_label = False
-            id_ = control.get("id")
-            if id_ and soup.find("label", attrs={"for": id_}):
-                has_label = True
-            if control.get("aria-label") or control.get("aria-labelledby"):
-                has_label = True
-            parent = control.find_parent("label")
-            if parent is not None:
-                has_label = True
-            if not has_label:
-                issues.append({
-                    "code": "FORM_CONTROL_NO_LABEL",
-                    "message": "Form control is missing an accessible label.",
-                    "context": str(control)[:200],
-                })
+            if el.get("aria-label") or el.get("aria-labelledby"):
+                continue
+            if next(el.iterancestors("label"), None) is not None:
+                continue
+            pending_controls.append(el)
 
-        return issues
+    # Heading order (simple check for jumps); stops at the first jump
+    if any(b - a > 1 for a, b in pairwise(headings)):
+        heading_issues.append({
+            "code": "HEADING_ORDER",
+            "message": "Heading level jumps (may confuse screen readers).",
+            "context": f"sequence: {headings[:20]}",
+        })
+
+    for control in pending_controls:
+        id_ = control.get("id")
+        if not (id_ and id_ in labelled_ids):
+            form_issues.append({
+                "code": "FORM_CONTROL_NO_LABEL",
+                "message": "Form control is missing an accessible label.",
+                "context": element_context(control),
+            })
+
+    return img_issues + link_issues + heading_issues + form_issues
+
+
+def analyze_html(html: str, exclude_analyzers: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Analyze HTML using plugin-based analyzers.
+    
+    Falls back to the old implementation if analyzers are not available.
+    exclude_analyzers: analyzer names to skip (any iterable; a frozenset avoids re-building)
+    """
+    try:
+        from .analyzer_plugin import analyze_html as plugin_analyze
+        return plugin_analyze(html, exclude_analyzers=exclude_analyzers)
+    except Exception:
+        # fallback to legacy implementation
+        return _legacy_analyze_html(html)
 
 
 def summarize_issues(issues: List[Dict[str, Any]]) -> Dict[str, int]:
-    counts: Dict[str, int] = {}
-    for it in issues:
-        counts[it.get("code", "UNKNOWN")] = counts.get(it.get("code", "UNKNOWN"), 0) + 1
-    return counts
+    return dict(Counter(it.get("code", "UNKNOWN") for it in issues))
+
+
+def _ai_disk_cache():
+    """On-disk cache for AI suggestions so re-runs of the same scan skip the
+    API call; needs `diskcache` and SITEABLE_AI_CACHE_DIR, else None."""
+    global _AI_DISK_CACHE
+    if _AI_DISK_CACHE is None and diskcache is not None:
+        cache_dir = os.environ.get("SITEABLE_AI_CACHE_DIR")
+        if cache_dir:
+            _AI_DISK_CACHE = diskcache.Cache(cache_dir)
+    return _AI_DISK_CACHE
 
 
 def suggest_fixes_with_ai(html: str, issues: List[Dict[str, Any]], model: str = "gpt-3.5-turbo") -> str:
@@ -117,6 +166,14 @@ def suggest_fixes_with_ai(html: str, issues: List[Dict[str, Any]], model: str =
         f"Found issues: {issues}\n\nHTML snippet (truncated):\n" + html[:4000]
     )
 
+    key = content_digest(f"{model}\0{prompt}")
+    cached = _AI_CACHE.get(key)
+    disk = _ai_disk_cache()
+    if cached is None and disk is not None:
+        cached = disk.get(key)
+    if cached is not None:
+        return cached
+
     try:
         resp = openai.ChatCompletion.create(
             model=model,
@@ -124,6 +181,12 @@ def suggest_fixes_with_ai(html: str, issues: List[Dict[str, Any]], model: str =
             max_tokens=800,
             temperature=0.2,
         )
-        return resp.choices[0].message.content.strip()
+        suggestion = resp.choices[0].message.content.strip()
     except Exception as e:
         return f"AI suggestion failed: {e}"
+
+    # Only successful answers are cached
+    _AI_CACHE.set(key, suggestion)
+    if disk is not None:
+        disk.set(key, suggestion)
+    return suggestion
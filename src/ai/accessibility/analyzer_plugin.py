@@ -1,53 +1,87 @@
 """Plugin-based accessibility analyzer using registered analyzers."""
-from typing import List, Dict, Any
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from core.analyzer import get_registry
+from core.analyzer import Analyzer, get_registry, parse_html
+from core.cache import LRUCache, content_digest
 
+# (registry version, registered analyzers) captured on first use
+_ANALYZERS_CACHE: Optional[Tuple[int, Tuple[Tuple[str, Analyzer], ...]]] = None
 
-def analyze_html(html: str, exclude_analyzers: List[str] = None) -> List[Dict[str, Any]]:
-    """Analyze HTML using all registered analyzers (except excluded ones).
-    
-    Returns a list of issues with keys: code, message, context, analyzer.
-    """
-    from analyzers import init_default_analyzers
-    
-    # Ensure analyzers are initialized
+# Raw analyzer output keyed on (analyzer name, HTML digest); site scans see the
+# same templates under many URLs
+_RESULT_CACHE = LRUCache(maxsize=1024)
+
+logger = logging.getLogger("siteable.analyzer")
+
+
+def _registered_analyzers() -> Tuple[Tuple[str, Analyzer], ...]:
+    """Return (name, analyzer) pairs, initializing the defaults on first use."""
+    global _ANALYZERS_CACHE
     registry = get_registry()
+    cache = _ANALYZERS_CACHE
+    if cache is not None and cache[0] == registry.version:
+        return cache[1]
+
     if not registry.list():
+        from analyzers import init_default_analyzers
         init_default_analyzers()
+
+    items = tuple(registry.list().items())
+    _ANALYZERS_CACHE = (registry.version, items)
+    # A name may now refer to a different analyzer instance
+    _RESULT_CACHE.clear()
+    return items
+
+
+def invalidate_analyzer_cache() -> None:
+    """Drop the cached analyzer list and results so the next call re-runs everything."""
+    global _ANALYZERS_CACHE
+    _ANALYZERS_CACHE = None
+    _RESULT_CACHE.clear()
+
+
+def analyze_html(html: str, exclude_analyzers: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Analyze HTML using all registered analyzers (except excluded ones).
     
-    exclude_analyzers = exclude_analyzers or []
+    Returns a list of issues with keys: code, message, context, analyzer.
+    """
+    # frozenset() of a frozenset is a no-op, so callers can pre-build it once
+    excluded = frozenset(exclude_analyzers or ())
     issues = []
+    analyzers = _registered_analyzers()
+    html_key = content_digest(html)
+    # Parsed on the first cache miss and shared by the remaining analyzers
+    soup = None
     
-    for name, analyzer in registry.list().items():
-        if name not in exclude_analyzers:
+    for name, analyzer in analyzers:
+        if name not in excluded:
             try:
-                analyzer_issues = analyzer.analyze(html)
-                # Add analyzer name to each issue
-                for issue in analyzer_issues:
-                    issue['analyzer'] = name
-                issues.extend(analyzer_issues)
-            except Exception:
-                pass
+                key = (name, html_key)
+                analyzer_issues = _RESULT_CACHE.get(key)
+                if analyzer_issues is None:
+                    if soup is None:
+                        soup = parse_html(html)
+                    analyzer_issues = analyzer.analyze_soup(soup, html)
+                    _RESULT_CACHE.set(key, analyzer_issues)
+                # Tag with the analyzer name on a copy; cached issue dicts are
+                # shared between calls and must not be mutated
+                issues.extend(
+                    {**issue, 'analyzer': issue.get('analyzer', name)}
+                    for issue in analyzer_issues
+                )
+            except Exception as e:
+                logger.warning(f"Analyzer {name} failed: {e}")
     
     return issues
 
 
 def summarize_issues(issues: List[Dict[str, Any]]) -> Dict[str, int]:
     """Summarize issues by code."""
-    counts: Dict[str, int] = {}
-    for it in issues:
-        code = it.get("code", "UNKNOWN")
-        counts[code] = counts.get(code, 0) + 1
-    return counts
+    return dict(Counter(it.get("code", "UNKNOWN") for it in issues))
 
 
 def list_analyzers() -> Dict[str, str]:
     """List available analyzers and their descriptions."""
-    from analyzers import init_default_analyzers
-    
-    registry = get_registry()
-    if not registry.list():
-        init_default_analyzers()
-    
-    return {name: analyzer.description for name, analyzer in registry.list().items()}
+    return {name: analyzer.description for name, analyzer in _registered_analyzers()}
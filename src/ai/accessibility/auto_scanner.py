@@ -1,52 +1,121 @@
+import copy
+from collections import deque
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 from typing import Dict, List
 from urllib.parse import urljoin, urlparse
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import time
 
+from core.cache import content_digest
+from core.document import parse_document
+
 from .analyzer import analyze_html
 
 
+@lru_cache(maxsize=4096)
+def _netloc_of(url: str) -> str:
+    return urlparse(url).netloc
+
+
 def _same_domain(start_netloc: str, url: str) -> bool:
     try:
-        return urlparse(url).netloc == start_netloc
+        return _netloc_of(url) == start_netloc
     except Exception:
         return False
 
 
-def scan_site(start_url: str, max_pages: int = 20, delay: float = 0.1) -> Dict[str, List[Dict]]:
+class _Throttle:
+    """Thread-safe minimum spacing between request starts."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def scan_site(
+    start_url: str,
+    max_pages: int = 20,
+    delay: float = 0.1,
+    concurrency: int = 4,
+) -> Dict[str, List[Dict]]:
     """Basic domain-limited crawler that scans pages and returns issues per URL.
 
-    This is intentionally simple and safe for small websites.
+    This is intentionally simple and safe for small websites. Up to
+    `concurrency` pages are fetched at once over a pooled session, and request
+    starts are spaced at least `delay` seconds apart.
     """
     headers = {"User-Agent": "SiteAble-Accessibility-Scanner/1.0"}
-    to_visit = [start_url]
+    to_visit = deque([start_url])
+    # Mirrors to_visit for O(1) membership checks
+    queued = {start_url}
     seen = set()
     issues_map = {}
+    # Template-heavy sites serve identical bodies under many URLs; analyze each once
+    analysis_cache: Dict[bytes, List[Dict]] = {}
     start_netloc = urlparse(start_url).netloc
+    concurrency = max(1, concurrency)
+    throttle = _Throttle(delay)
+
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    def fetch(url: str) -> str:
+        throttle.wait()
+        resp = session.get(url, timeout=10)
+        resp.raise_for_status()
+        return resp.text
+
+    # Workers only fetch; the crawl state is owned by this thread
+    with session, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending: Dict[Future, str] = {}
+        while to_visit or pending:
+            while to_visit and len(seen) < max_pages and len(pending) < concurrency:
+                url = to_visit.popleft()
+                queued.discard(url)
+                if url in seen:
+                    continue
+                seen.add(url)
+                pending[pool.submit(fetch, url)] = url
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                url = pending.pop(fut)
+                try:
+                    html = fut.result()
+                except Exception:
+                    continue
+
+                key = content_digest(html)
+                cached = analysis_cache.get(key)
+                if cached is None:
+                    cached = analysis_cache[key] = analyze_html(html)
+                issues_map[url] = copy.deepcopy(cached)
 
-    while to_visit and len(seen) < max_pages:
-        url = to_visit.pop(0)
-        if url in seen:
-            continue
-        seen.add(url)
-        try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            html = resp.text
-        except Exception:
-            continue
-
-        issues = analyze_html(html)
-        issues_map[url] = issues
-
-        soup = BeautifulSoup(html, 'lxml')
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            full = urljoin(url, href)
-            if _same_domain(start_netloc, full) and full not in seen and full not in to_visit:
-                to_visit.append(full)
-
-        time.sleep(delay)
+                doc = parse_document(html)
+                hrefs = doc.xpath('//a/@href') if doc is not None else []
+                for href in hrefs:
+                    full = urljoin(url, href)
+                    if _same_domain(start_netloc, full) and full not in seen and full not in queued:
+                        queued.add(full)
+                        to_visit.append(full)
 
     return issues_map
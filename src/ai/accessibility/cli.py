@@ -1,36 +1,162 @@
 import argparse
+import codecs
+import gzip
+import hashlib
 import json
 import logging
 import os
 import sys
-from typing import Any, Dict, List
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from dotenv import load_dotenv
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .__version__ import __version__
 from .analyzer import analyze_html, summarize_issues, suggest_fixes_with_ai
 from .analyzer_plugin import list_analyzers
 from .utils import fetch_url
 from core.logging import setup_logging
-from core.severity import (
-    CRITICAL,
-    MAJOR,
-    MINOR,
-    enrich_issues,
-    get_severity_emoji,
-    sort_by_severity,
-    summarize_by_severity,
-)
-
-# Load .env if present
-load_dotenv()
 
 logger = logging.getLogger("siteable")
 
 
-def _read_file(path: str) -> str:
+# Length of the fixed HTML kept in reports when it isn't written to a file
+_SNIPPET_LENGTH = 2000
+
+# Characters in a page URL that are replaced to form its fixed-HTML filename
+_FNAME_TABLE = str.maketrans({c: "_" for c in ":/?#&="})
+# Characters that used to survive in filenames; URLs containing any of them
+# get a short hash suffix so pages differing only in their query stay apart
+_FNAME_QUERY_CHARS = frozenset("?#&=")
+
+
+def _page_filename(page: str) -> str:
+    """Filename for a page's fixed HTML, e.g. https://a.com/x -> https_a.com_x.html."""
+    scheme, sep, rest = page.partition("://")
+    name = f"{scheme}_{rest.translate(_FNAME_TABLE)}" if sep else page.translate(_FNAME_TABLE)
+    if not _FNAME_QUERY_CHARS.isdisjoint(page):
+        name += "_" + hashlib.blake2b(page.encode("utf-8"), digest_size=4).hexdigest()
+    return name + ".html"
+
+
+def _emit_json(obj: Any, path: Optional[str] = None) -> None:
+    """Write a report as indented JSON to `path`, or to stdout when no path is given.
+
+    A `path` ending in ".gz" is gzip-compressed on the fly (level 1: JSON
+    reports compress very well even at the fastest setting). orjson output
+    is written as bytes (straight to sys.stdout.buffer for stdout) and
+    stdlib json is streamed with json.dump, so no intermediate str copy of
+    the report is built. Both write non-ASCII text as raw UTF-8, so the
+    report bytes do not depend on whether orjson is installed.
+    """
+    data = None
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # e.g. non-str keys or huge ints; let stdlib handle it
+
+    if path is None:
+        out = sys.stdout
+        buf = getattr(out, "buffer", None)
+        if buf is not None:
+            out.flush()
+            if data is not None:
+                buf.write(data)
+            else:
+                json.dump(obj, codecs.getwriter("utf-8")(buf), indent=2, ensure_ascii=False)
+            buf.write(b"\n")
+            buf.flush()
+        elif data is not None:
+            out.write(data.decode("utf-8"))
+            out.write("\n")
+        else:
+            json.dump(obj, out, indent=2, ensure_ascii=False)
+            out.write("\n")
+        return
+
+    if path.endswith(".gz"):
+        if data is not None:
+            with gzip.open(path, "wb", compresslevel=1) as f:
+                f.write(data)
+        else:
+            with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as f:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+    elif data is not None:
+        with open(path, "wb") as f:
+            f.write(data)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def _load_json(path: str) -> Any:
+    """Load a JSON file, parsing with orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+        return json.load(f)
+
+
+@lru_cache(maxsize=4)
+def _load_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+
+        with open(path, "r", encoding="utf-8") as cf:
+            return yaml.safe_load(cf) or {}
+    return _load_json(path)
+
+
+def _load_config(path: str) -> Dict[str, Any]:
+    """Load a JSON/YAML config file; cached until the file's mtime changes.
+
+    Raises ImportError for YAML files when PyYAML is not installed.
+    """
+    return _load_config_file(path, os.stat(path).st_mtime_ns)
+
+
+def _read_file(path: str) -> str:
+    # One read and one decode; skips text-mode newline translation
+    return Path(path).read_bytes().decode("utf-8", errors="replace")
+
+
+def _write_text(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _fix_result(
+    page: str,
+    future: Future,
+    outdir: Optional[str],
+    io_pool: Optional[ThreadPoolExecutor] = None,
+) -> Tuple[Dict[str, Any], Optional[Future]]:
+    """Report fields for one page's apply_fixes() result.
+
+    The fixed HTML goes to `outdir` when given (handed to `io_pool` if there
+    is one, in which case its write future is returned), otherwise a snippet
+    is kept in the report.
+    """
+    try:
+        fixed_html, applied = future.result()
+        result: Dict[str, Any] = {"fixed_fixes": applied}
+        if outdir:
+            path = os.path.join(outdir, _page_filename(page))
+            if io_pool is not None:
+                return result, io_pool.submit(_write_text, path, fixed_html)
+            _write_text(path, fixed_html)
+        else:
+            result["fixed_html_snippet"] = fixed_html[:_SNIPPET_LENGTH]
+        return result, None
+    except Exception as e:
+        return {"fixed_error": str(e)}, None
 
 
 def _merge_config(args: argparse.Namespace, cfg: Dict[str, Any]) -> argparse.Namespace:
@@ -41,21 +167,45 @@ def _merge_config(args: argparse.Namespace, cfg: Dict[str, Any]) -> argparse.Nam
     return args
 
 
+# None until first probed, then True/False; see _rich_available()
+_USE_RICH = None
+
+
+def _rich_available() -> bool:
+    """Whether rich can be imported; probed once per process."""
+    global _USE_RICH
+    if _USE_RICH is None:
+        try:
+            import rich.console  # noqa: F401
+            import rich.table  # noqa: F401
+
+            _USE_RICH = True
+        except ImportError:
+            _USE_RICH = False
+    return _USE_RICH
+
+
 def _pretty_print_issues_grouped(issues: List[Dict[str, Any]]) -> None:
     """Print issues grouped by severity with colors and emojis."""
-    try:
+    from core.severity import (
+        CRITICAL,
+        MAJOR,
+        MINOR,
+        SEVERITY_EMOJIS,
+        enrich_and_summarize,
+        sort_by_severity,
+    )
+
+    use_rich = _rich_available()
+    if use_rich:
         from rich.console import Console
         from rich.table import Table
 
         console = Console()
-        use_rich = True
-    except ImportError:
-        use_rich = False
 
     # Enrich and sort issues
-    enriched = enrich_issues(issues)
+    enriched, severity_counts = enrich_and_summarize(issues)
     sorted_issues = sort_by_severity(enriched)
-    severity_counts = summarize_by_severity(enriched)
 
     if use_rich:
         # Summary table
@@ -84,13 +234,16 @@ def _pretty_print_issues_grouped(issues: List[Dict[str, Any]]) -> None:
             issues_table.add_column("Context", max_width=40)
 
             for issue in sorted_issues[:50]:  # Limit to 50 issues in pretty print
-                emoji = get_severity_emoji(issue.get("severity", MINOR))
+                get = issue.get
+                context = get("context") or ""
+                if len(context) > 40:
+                    context = context[:40] + "..."
                 issues_table.add_row(
-                    emoji,
-                    issue.get("code", ""),
-                    issue.get("wcag", ""),
-                    issue.get("message", ""),
-                    (issue.get("context", "") or "")[:40] + "...",
+                    SEVERITY_EMOJIS.get(get("severity"), "⚪"),
+                    get("code", ""),
+                    get("wcag") or "",
+                    get("message", ""),
+                    context,
                 )
 
             console.print(issues_table)
@@ -110,10 +263,11 @@ def _pretty_print_issues_grouped(issues: List[Dict[str, Any]]) -> None:
         if sorted_issues:
             print("=== Issues Found ===")
             for issue in sorted_issues[:50]:
-                emoji = get_severity_emoji(issue.get("severity", MINOR))
-                code = issue.get("code", "UNKNOWN")
-                wcag = issue.get("wcag", "")
-                message = issue.get("message", "")
+                get = issue.get
+                emoji = SEVERITY_EMOJIS.get(get("severity"), "⚪")
+                code = get("code", "UNKNOWN")
+                wcag = get("wcag") or ""
+                message = get("message", "")
                 print(f"  {emoji} [{code}] (WCAG {wcag})")
                 print(f"     {message}")
                 print()
@@ -167,6 +321,11 @@ def _pretty_print_report(report: Dict[str, Any]) -> None:
 
 
 def main(argv=None):
+    # Load .env if present; before the parser so it can supply env defaults
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
     parser = argparse.ArgumentParser(
         description="SiteAble - AI-Powered Accessibility Scanner for Websites",
         epilog="Examples:\n"
@@ -199,7 +358,7 @@ def main(argv=None):
     )
 
     # Output options
-    parser.add_argument("--output", "-o", help="Write output to this file (default: stdout)")
+    parser.add_argument("--output", "-o", help="Write output to this file; gzip-compressed if it ends in .gz (default: stdout)")
     parser.add_argument(
         "--format", "-f",
         choices=["json", "pretty", "html"],
@@ -235,6 +394,12 @@ def main(argv=None):
         default=float(os.environ.get("REQUEST_DELAY", "0.0")),
         help="Delay between requests for --scan-site (default: 0.0)",
     )
+    parser.add_argument(
+        "--analysis-workers",
+        type=int,
+        default=0,
+        help="Worker processes that analyze pages during --scan-site (default: 0, analyze in the crawler)",
+    )
     parser.add_argument(
         "--rate-limit",
         type=float,
@@ -287,18 +452,11 @@ def main(argv=None):
     # Load config file if present and merge
     if args.config:
         try:
-            config_path = args.config
-            if config_path.endswith((".yaml", ".yml")):
-                try:
-                    import yaml
-                    with open(config_path, "r", encoding="utf-8") as cf:
-                        cfg = yaml.safe_load(cf)
-                except ImportError:
-                    print("PyYAML not installed. Install with: pip install pyyaml", file=sys.stderr)
-                    return 2
-            else:
-                with open(config_path, "r", encoding="utf-8") as cf:
-                    cfg = json.load(cf)
+            try:
+                cfg = _load_config(args.config)
+            except ImportError:
+                print("PyYAML not installed. Install with: pip install pyyaml", file=sys.stderr)
+                return 2
             args = _merge_config(args, cfg)
         except Exception as e:
             print(f"Failed to load config {args.config}: {e}", file=sys.stderr)
@@ -326,66 +484,110 @@ def main(argv=None):
     if not args.url and not args.file:
         parser.error("one of the arguments --url --file is required")
 
+    from core.severity import enrich_and_summarize, summarize_by_severity
+
     # Compute exclude list
     exclude_analyzers = None
     if args.exclude_analyzers:
-        exclude_analyzers = [a.strip() for a in args.exclude_analyzers.split(",") if a.strip()]
+        exclude_analyzers = frozenset(a.strip() for a in args.exclude_analyzers.split(",") if a.strip())
 
     # Site scan flow
     if args.scan_site:
         if not args.url:
             parser.error("--scan-site requires --url to be specified")
 
+        from core.cache import content_digest
         from crawler.crawler_scanner import scan_site
         from .fixes import apply_fixes
 
         logger.info(f"Starting site scan: {args.url}")
         logger.info(f"Max pages: {args.max_pages}, Concurrency: {args.concurrency}")
 
-        issues_map = scan_site(
-            args.url,
-            max_pages=args.max_pages,
-            concurrency=args.concurrency,
-            delay=args.delay,
-            db_path=args.save_db,
-            exclude_analyzers=exclude_analyzers,
-        )
+        if args.apply_fixes and args.outdir:
+            os.makedirs(args.outdir, exist_ok=True)
+
+        # Fix each page from the HTML the crawler already downloaded. Fixing is
+        # CPU-bound, so pages go to worker processes as they arrive and the
+        # fixes run alongside the rest of the crawl
+        fix_pool = ProcessPoolExecutor() if args.apply_fixes else None
+        fix_futures: Dict[str, Future] = {}
+        # Templated sites serve the same body under many URLs; fix each
+        # (body, issue codes) combination once
+        fixes_by_body: Dict[Tuple[bytes, FrozenSet[str]], Future] = {}
+
+        def on_page(url: str, html_text: str, issues: List[Dict[str, Any]]) -> None:
+            key = (content_digest(html_text), frozenset(i.get("code") for i in issues))
+            future = fixes_by_body.get(key)
+            if future is None:
+                future = fix_pool.submit(
+                    apply_fixes, html_text, issues, max_length=None if args.outdir else _SNIPPET_LENGTH,
+                )
+                fixes_by_body[key] = future
+            fix_futures[url] = future
+
+        try:
+            issues_map = scan_site(
+                args.url,
+                max_pages=args.max_pages,
+                concurrency=args.concurrency,
+                delay=args.delay,
+                db_path=args.save_db,
+                exclude_analyzers=exclude_analyzers,
+                on_page=on_page if args.apply_fixes else None,
+                analysis_workers=args.analysis_workers,
+            )
+        except BaseException:
+            if fix_pool is not None:
+                fix_pool.shutdown(cancel_futures=True)
+            raise
 
         report = {"pages": {}, "version": __version__}
-        all_issues = []
+        # Site totals are added up from the per-page counts
+        site_severity = summarize_by_severity(())
+        # Fixed files are written in the background while later results are collected
+        io_pool = ThreadPoolExecutor(max_workers=16) if args.apply_fixes and args.outdir else None
+        pending_writes: List[Tuple[Dict[str, Any], Future]] = []
 
         for page, issues in issues_map.items():
             # Enrich issues with severity
-            enriched = enrich_issues(issues)
+            enriched, severity_counts = enrich_and_summarize(issues)
             entry = {
                 "issues": enriched,
                 "summary": summarize_issues(issues),
-                "severity_summary": summarize_by_severity(enriched),
+                "severity_summary": severity_counts,
             }
-            all_issues.extend(enriched)
+            for level, count in severity_counts.items():
+                site_severity[level] += count
 
             if args.apply_fixes:
-                try:
-                    html_text = fetch_url(page)
-                    fixed_html, applied = apply_fixes(html_text, issues)
-                    entry["fixed_fixes"] = applied
-                    if args.outdir:
-                        os.makedirs(args.outdir, exist_ok=True)
-                        fname = page.replace("://", "_").replace("/", "_") + ".html"
-                        with open(os.path.join(args.outdir, fname), "w", encoding="utf-8") as f:
-                            f.write(fixed_html)
-                    else:
-                        entry["fixed_html_snippet"] = fixed_html[:2000]
-                except Exception as e:
-                    entry["fixed_error"] = str(e)
+                future = fix_futures.get(page)
+                if future is None:
+                    entry["fixed_error"] = "Page content not available (fetch failed or blocked by robots.txt)"
+                else:
+                    result, write = _fix_result(page, future, args.outdir, io_pool)
+                    entry.update(result)
+                    if write is not None:
+                        pending_writes.append((entry, write))
 
             report["pages"][page] = entry
 
+        if fix_pool is not None:
+            fix_pool.shutdown()
+        for entry, write in pending_writes:
+            error = write.exception()
+            if error is not None:
+                entry.pop("fixed_fixes", None)
+                entry["fixed_error"] = str(error)
+        if io_pool is not None:
+            io_pool.shutdown()
+
         # Add overall severity summary
-        report["severity_summary"] = summarize_by_severity(all_issues)
+        report["severity_summary"] = site_severity
 
         if args.ai:
-            report["ai_report"] = suggest_fixes_with_ai("\n".join(issues_map.keys()), [])
+            # One compact per-page summary instead of a bare URL list
+            site_summary = {page: entry["summary"] for page, entry in report["pages"].items()}
+            report["ai_report"] = suggest_fixes_with_ai(json.dumps(site_summary, separators=(",", ":")), [])
 
         # Generate HTML report if requested
         if args.output_html:
@@ -400,12 +602,7 @@ def main(argv=None):
 
         # Output
         if args.format == "json":
-            out = json.dumps(report, indent=2)
-            if args.output:
-                with open(args.output, "w", encoding="utf-8") as f:
-                    f.write(out)
-            else:
-                print(out)
+            _emit_json(report, args.output)
         else:
             _pretty_print_report(report)
 
@@ -426,10 +623,9 @@ def main(argv=None):
     issues = analyze_html(html, exclude_analyzers=exclude_analyzers)
 
     # Enrich issues with severity
-    enriched_issues = enrich_issues(issues)
+    enriched_issues, severity_summary = enrich_and_summarize(issues)
 
     summary = summarize_issues(issues)
-    severity_summary = summarize_by_severity(enriched_issues)
 
     report = {
         "issues": enriched_issues,
@@ -442,9 +638,9 @@ def main(argv=None):
         from .fixes import apply_fixes
 
         try:
-            fixed_html, applied = apply_fixes(html, issues)
+            fixed_html, applied = apply_fixes(html, issues, max_length=_SNIPPET_LENGTH)
             report["fixed_fixes"] = applied
-            report["fixed_html_snippet"] = fixed_html[:2000]
+            report["fixed_html_snippet"] = fixed_html
         except Exception as e:
             report["fixed_error"] = str(e)
 
@@ -466,12 +662,7 @@ def main(argv=None):
             logger.error(f"Failed to generate HTML report: {e}")
 
     if args.format == "json":
-        out = json.dumps(report, indent=2)
-        if args.output:
-            with open(args.output, "w", encoding="utf-8") as f:
-                f.write(out)
-        else:
-            print(out)
+        _emit_json(report, args.output)
     else:
         _pretty_print_report(report)
 
@@ -1,39 +1,59 @@
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
-from bs4 import BeautifulSoup
 import re
 
+from core.document import element_context, parse_document
 
+_HEX_RE = re.compile(r"#([0-9a-fA-F]{3,6})")
+_RGB_RE = re.compile(r"rgba?\(([^)]+)\)")
+# One `property: value` declaration of an inline style attribute
+_STYLE_DECL_RE = re.compile(r"\s*([a-zA-Z-]+)\s*:\s*([^;]+?)\s*(?:;|$)")
+
+# The color helpers below are pure and pages reuse a small palette, so they
+# are memoized
+
+
+@lru_cache(maxsize=1024)
 def _parse_color(value: str) -> Optional[str]:
     if not value:
         return None
     v = value.strip()
-    m = re.match(r"#([0-9a-fA-F]{3,6})", v)
+    m = _HEX_RE.match(v)
     if m:
         hexv = m.group(0)
         if len(m.group(1)) == 3:
             h = m.group(1)
             hexv = "#" + ''.join([c*2 for c in h])
         return hexv.lower()
-    m = re.match(r"rgba?\(([^)]+)\)", v)
+    m = _RGB_RE.match(v)
     if m:
         parts = [int(p.strip().split('%')[0]) for p in m.group(1).split(',')[:3]]
         return '#%02x%02x%02x' % tuple(parts)
     return None
 
 
+@lru_cache(maxsize=1024)
 def _hex_to_rgb(hexstr: str) -> Tuple[int, int, int]:
     h = hexstr.lstrip('#')
     return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
 
 
+def _linearize(c: int) -> float:
+    s = c / 255.0
+    return s/12.92 if s <= 0.03928 else ((s+0.055)/1.055) ** 2.4
+
+
+# Linearized sRGB value for every 8-bit channel level
+_LINEAR = tuple(_linearize(c) for c in range(256))
+
+
+@lru_cache(maxsize=1024)
 def _relative_luminance(rgb: Tuple[int, int, int]) -> float:
-    def chan(c):
-        s = c / 255.0
-        return s/12.92 if s <= 0.03928 else ((s+0.055)/1.055) ** 2.4
     r, g, b = rgb
-    return 0.2126 * chan(r) + 0.7152 * chan(g) + 0.0722 * chan(b)
+    return 0.2126 * _LINEAR[r] + 0.7152 * _LINEAR[g] + 0.0722 * _LINEAR[b]
 
 
+@lru_cache(maxsize=1024)
 def _contrast_ratio(hex1: str, hex2: str) -> float:
     l1 = _relative_luminance(_hex_to_rgb(hex1))
     l2 = _relative_luminance(_hex_to_rgb(hex2))
@@ -51,19 +71,90 @@ def _recommend_foreground(bg_hex: str) -> str:
     return white
 
 
-def apply_fixes(html: str, issues: List[Dict], ai_alt_map: Dict[str, str] = None) -> Tuple[str, List[Dict]]:
+# Issue codes whose fix is setting an image's alt text
+_ALT_CODES = frozenset({'IMG_MISSING_ALT', 'LINK_IMG_MISSING_ALT'})
+
+
+class _SinkFull(Exception):
+    pass
+
+
+class _PrefixSink:
+    """File-like target that collects what is written to it; with a `limit`
+    it keeps the first `limit` bytes and then aborts the serializer."""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.parts: List[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        self.parts.append(data)
+        self.size += len(data)
+        if self.limit is not None and self.size >= self.limit:
+            raise _SinkFull()
+
+
+# Doctype libxml2 gives a document that does not declare one
+_DEFAULT_DOCTYPE = (
+    '<!DOCTYPE html PUBLIC "-//W3C//DTD HTML 4.0 Transitional//EN" '
+    '"http://www.w3.org/TR/REC-html40/loose.dtd">'
+)
+_DEFAULT_DOCTYPE_LINE = _DEFAULT_DOCTYPE.encode('ascii') + b'\n'
+_DOCTYPE_RE = re.compile(r'<!doctype', re.IGNORECASE)
+
+
+def _serialize(doc, keep_doctype: bool, max_length: Optional[int] = None) -> str:
+    # Serialize the whole tree so comments and processing instructions
+    # around the root element are kept; a truncated result is always a
+    # prefix of the full one
+    tree = doc.getroottree()
+    skip = 0
+    if not keep_doctype and tree.docinfo.doctype == _DEFAULT_DOCTYPE:
+        skip = len(_DEFAULT_DOCTYPE_LINE)
+    # UTF-8 needs at most 4 bytes per character
+    sink = _PrefixSink(None if max_length is None else skip + max_length * 4)
+    try:
+        tree.write(sink, method='html', encoding='utf-8')
+    except _SinkFull:
+        pass
+    data = b''.join(sink.parts)
+    if skip and data.startswith(_DEFAULT_DOCTYPE_LINE):
+        data = data[skip:]
+    return data.decode('utf-8', errors='ignore')[:max_length]
+
+
+def apply_fixes(
+    html: str,
+    issues: List[Dict],
+    ai_alt_map: Dict[str, str] = None,
+    max_length: Optional[int] = None,
+) -> Tuple[str, List[Dict]]:
     """Apply basic fixes to the HTML string.
 
     - Add alt attributes to images flagged as missing (uses ai_alt_map by `src` or fallback to filename)
     - For low contrast, replace inline `color` with recommended foreground color
+    Each fix only runs when `issues` reports its code; with nothing to fix
+    the HTML is returned unparsed.
+    With `max_length`, only the first `max_length` characters of the fixed
+    HTML are returned and serialization stops once they are produced.
     Returns (fixed_html, applied_fixes)
     """
+    codes = {i.get('code') for i in issues}
+    fix_alt = not codes.isdisjoint(_ALT_CODES)
+    fix_contrast = 'LOW_CONTRAST' in codes
+    if not (fix_alt or fix_contrast):
+        return html[:max_length], []
+
+    doc = parse_document(html)
+    if doc is None:
+        return html[:max_length], []
+
     ai_alt_map = ai_alt_map or {}
-    soup = BeautifulSoup(html, 'lxml')
     applied = []
 
     # Fix missing alt
-    for img in soup.find_all('img'):
+    for img in (doc.iter('img') if fix_alt else ()):
         alt = img.get('alt')
         if not alt or not alt.strip():
             src = img.get('src') or ''
@@ -72,48 +163,36 @@ def apply_fixes(html: str, issues: List[Dict], ai_alt_map: Dict[str, str] = None
                 # derive from filename
                 filename = src.split('/')[-1] if '/' in src else src
                 suggestion = filename or 'image'
-            img['alt'] = suggestion
-            applied.append({'code': 'IMG_MISSING_ALT', 'fix': f"set alt='{suggestion}'", 'context': str(img)[:200]})
+            img.set('alt', suggestion)
+            applied.append({'code': 'IMG_MISSING_ALT', 'fix': f"set alt='{suggestion}'", 'context': element_context(img)})
 
     # Fix low contrast by adjusting color in inline style
-    for el in soup.find_all(True):
+    for el in (doc.xpath('//*[@style]') if fix_contrast else ()):
         style = el.get('style')
         if not style:
             continue
-        parts = [p for p in style.split(';') if p.strip()]
-        new_parts = parts.copy()
         color = None
+        color_span = None
         bgcolor = None
-        for i, part in enumerate(parts):
-            if ':' not in part:
-                continue
-            k, v = part.split(':', 1)
-            k = k.strip().lower()
-            v = v.strip()
+        for m in _STYLE_DECL_RE.finditer(style):
+            k = m.group(1).lower()
             if k == 'color':
-                color = _parse_color(v)
-            if k in ('background-color', 'background'):
-                bgcolor = _parse_color(v)
+                color = _parse_color(m.group(2))
+                color_span = m.span(2)
+            elif k in ('background-color', 'background'):
+                bgcolor = _parse_color(m.group(2))
         if color and bgcolor:
             try:
                 ratio = _contrast_ratio(color, bgcolor)
                 if ratio < 4.5:
                     new_fg = _recommend_foreground(bgcolor)
-                    # replace color part
-                    replaced = False
-                    for i, part in enumerate(new_parts):
-                        if ':' not in part:
-                            continue
-                        k, v = part.split(':', 1)
-                        if k.strip().lower() == 'color':
-                            new_parts[i] = f"color: {new_fg}"
-                            replaced = True
-                            break
-                    if not replaced:
-                        new_parts.append(f"color: {new_fg}")
-                    el['style'] = '; '.join(new_parts)
-                    applied.append({'code': 'LOW_CONTRAST', 'fix': f"set color={new_fg}", 'context': str(el)[:200]})
+                    # replace just the value of the color declaration
+                    start, end = color_span
+                    el.set('style', style[:start] + new_fg + style[end:])
+                    applied.append({'code': 'LOW_CONTRAST', 'fix': f"set color={new_fg}", 'context': element_context(el)})
             except Exception:
                 pass
 
-    return str(soup), applied
+    # Keep a doctype only if the page had one; lxml would otherwise add its default
+    keep_doctype = _DOCTYPE_RE.search(html) is not None
+    return _serialize(doc, keep_doctype, max_length), applied
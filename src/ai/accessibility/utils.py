@@ -1,8 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
+
+# Shared across fetch_url calls so repeated fetches to a host reuse the
+# pooled keep-alive connection instead of a new TCP/TLS handshake each time.
+# Sized for callers that fetch from several threads (e.g. API workers).
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "SiteAble-Accessibility-Checker/1.0"})
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
 
 def fetch_url(url: str, timeout: int = 10) -> str:
     """Fetch a URL and return its text. Raises requests.HTTPError on bad status."""
-    headers = {"User-Agent": "SiteAble-Accessibility-Checker/1.0"}
-    resp = requests.get(url, headers=headers, timeout=timeout)
+    resp = _SESSION.get(url, timeout=timeout)
     resp.raise_for_status()
     return resp.text
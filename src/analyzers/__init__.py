@@ -14,7 +14,34 @@ from analyzers.plugins import (
     SkipLinkAnalyzer,
     TableAnalyzer,
 )
-from core.analyzer import get_registry
+from typing import FrozenSet, Optional, Tuple
+
+from core.analyzer import Analyzer, get_registry
+
+# Built-in analyzer instances, created on first use and reused afterwards
+_DEFAULT_ANALYZERS: Optional[Tuple[Analyzer, ...]] = None
+
+
+def _default_analyzers() -> Tuple[Analyzer, ...]:
+    global _DEFAULT_ANALYZERS
+    if _DEFAULT_ANALYZERS is None:
+        _DEFAULT_ANALYZERS = (
+            # Original analyzers
+            AltTextAnalyzer(),
+            FormLabelAnalyzer(),
+            HeadingOrderAnalyzer(),
+            ContrastAnalyzer(),
+            LinkTextAnalyzer(),
+            # New analyzers (Phase 2)
+            LanguageAnalyzer(),
+            ButtonAnalyzer(),
+            DocumentStructureAnalyzer(),
+            TableAnalyzer(),
+            ARIAAnalyzer(),
+            SkipLinkAnalyzer(),
+            MediaAnalyzer(),
+        )
+    return _DEFAULT_ANALYZERS
 
 
 def init_default_analyzers() -> None:
@@ -22,29 +49,18 @@ def init_default_analyzers() -> None:
 
     This function registers all the default accessibility analyzers
     with the global registry. It's called lazily when analyzers are
-    first needed.
+    first needed. The instances are built once, and names that are
+    already registered are left alone, so repeated calls are cheap and
+    don't invalidate caches keyed on the registry version.
     """
     registry = get_registry()
+    for analyzer in _default_analyzers():
+        if registry.get(analyzer.name) is None:
+            registry.register(analyzer)
+
 
-    # Original analyzers
-    registry.register(AltTextAnalyzer())
-    registry.register(FormLabelAnalyzer())
-    registry.register(HeadingOrderAnalyzer())
-    registry.register(ContrastAnalyzer())
-    registry.register(LinkTextAnalyzer())
-
-    # New analyzers (Phase 2)
-    registry.register(LanguageAnalyzer())
-    registry.register(ButtonAnalyzer())
-    registry.register(DocumentStructureAnalyzer())
-    registry.register(TableAnalyzer())
-    registry.register(ARIAAnalyzer())
-    registry.register(SkipLinkAnalyzer())
-    registry.register(MediaAnalyzer())
-
-
-# List of all available analyzer names for reference
-ANALYZER_NAMES = [
+# All available analyzer names for reference
+ANALYZER_NAMES: FrozenSet[str] = frozenset({
     "alt_text",
     "form_labels",
     "heading_order",
@@ -57,4 +73,4 @@ ANALYZER_NAMES = [
     "aria",
     "skip_link",
     "media",
-]
+})
@@ -4,19 +4,22 @@ This module contains all built-in accessibility analyzers that implement
 the Analyzer interface. Each analyzer checks for specific WCAG violations.
 """
 
+import colorsys
 import re
-from typing import Any, Dict, List, Optional, Set
+from functools import lru_cache
+from itertools import pairwise
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from bs4 import BeautifulSoup, Tag
 
-from core.analyzer import Analyzer
+from core.analyzer import Analyzer, parse_html, tag_index
 
 
 # =============================================================================
 # VALID ARIA ROLES (WCAG 4.1.2)
 # =============================================================================
 
-VALID_ARIA_ROLES: Set[str] = {
+VALID_ARIA_ROLES: FrozenSet[str] = frozenset({
     # Landmark roles
     "banner", "complementary", "contentinfo", "form", "main", "navigation",
     "region", "search",
@@ -32,10 +35,8 @@ VALID_ARIA_ROLES: Set[str] = {
     "radio", "radiogroup", "scrollbar", "searchbox", "slider", "spinbutton",
     "status", "switch", "tab", "tablist", "tabpanel", "textbox", "timer",
     "tree", "treegrid", "treeitem",
-    # Live region roles
-    "alert", "log", "marquee", "status", "timer",
-    # Window roles
-    "alertdialog", "dialog",
+    # Live region roles (alert, log, marquee, status, timer) and window roles
+    # (alertdialog, dialog) are listed with the widget roles above
     # Abstract roles (shouldn't be used directly but may appear)
     "command", "composite", "input", "landmark", "range", "roletype",
     "section", "sectionhead", "select", "structure", "widget", "window",
@@ -43,10 +44,10 @@ VALID_ARIA_ROLES: Set[str] = {
     "application",
     # Generic role
     "generic",
-}
+})
 
 # Valid language codes (ISO 639-1)
-VALID_LANG_CODES: Set[str] = {
+VALID_LANG_CODES: FrozenSet[str] = frozenset({
     "aa", "ab", "ae", "af", "ak", "am", "an", "ar", "as", "av", "ay", "az",
     "ba", "be", "bg", "bh", "bi", "bm", "bn", "bo", "br", "bs", "ca", "ce",
     "ch", "co", "cr", "cs", "cu", "cv", "cy", "da", "de", "dv", "dz", "ee",
@@ -63,7 +64,112 @@ VALID_LANG_CODES: Set[str] = {
     "te", "tg", "th", "ti", "tk", "tl", "tn", "to", "tr", "ts", "tt", "tw",
     "ty", "ug", "uk", "ur", "uz", "ve", "vi", "vo", "wa", "wo", "xh", "yi",
     "yo", "za", "zh", "zu",
-}
+})
+
+
+# Heading tag names; find_all() matches a list by name lookup instead of
+# running a regex against every tag in the document
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+
+
+# Linearized sRGB value for every 8-bit channel level (WCAG relative luminance)
+_SRGB_LINEAR = tuple(
+    s / 12.92 if s <= 0.03928 else ((s + 0.055) / 1.055) ** 2.4
+    for s in (c / 255.0 for c in range(256))
+)
+
+
+# Color value formats understood by ContrastAnalyzer._parse_color, in one
+# alternation so a value is matched once; the named group tells the format
+_COLOR_RE = re.compile(
+    r"#(?P<hex>[0-9a-fA-F]{3,6})"
+    r"|rgba?\((?P<rgb>[^)]+)\)"
+    r"|hsla?\((?P<hsl>[^)]+)\)"
+)
+
+# Common skip link wordings, combined so each link costs a single search
+_SKIP_LINK_RE = re.compile(
+    "|".join([
+        r"skip.*main",
+        r"skip.*content",
+        r"skip.*nav",
+        r"jump.*content",
+        r"jump.*main",
+    ]),
+    re.I,
+)
+
+# Attributes that give an element an accessible name on their own
+_NAME_ATTRS = ("aria-label", "aria-labelledby", "title")
+_INPUT_NAME_ATTRS = ("value",) + _NAME_ATTRS
+
+
+def _has_label_attr(attrs: Dict[str, Any], names=_NAME_ATTRS) -> bool:
+    """Whether any of `names` is set to a non-blank value in `attrs`."""
+    for name in names:
+        value = attrs.get(name)
+        if value and value.strip():
+            return True
+    return False
+
+
+# color / background declarations of an inline style attribute
+_COLOR_DECL_RE = re.compile(r"(?:^|;)\s*(color|background-color|background)\s*:\s*([^;]*)", re.I)
+
+
+def _clamp_rgb(r: int, g: int, b: int) -> Tuple[int, int, int]:
+    """Clamp channel values to 0-255, as CSS does for out-of-range rgb()."""
+    return min(max(r, 0), 255), min(max(g, 0), 255), min(max(b, 0), 255)
+
+
+def _first_within(ancestor: Tag, elements: List[Tag]) -> Optional[Tag]:
+    """First of `elements` inside `ancestor`, like `ancestor.find(...)` on an indexed list."""
+    for el in elements:
+        for parent in el.parents:
+            if parent is ancestor:
+                return el
+    return None
+
+
+def _snippet(el: Tag, limit: int = 200) -> str:
+    """`str(el)[:limit]`, serializing only as much of the subtree as fits."""
+    parts: List[str] = []
+    _write_prefix(el, parts, limit)
+    return "".join(parts)[:limit]
+
+
+def _write_prefix(el: Tag, parts: List[str], budget: int) -> int:
+    """Append el's markup to `parts` until `budget` characters are written.
+
+    Returns the budget left over. Recursion depth stays below `budget`,
+    since every nested opening tag uses up at least two characters.
+    """
+    if el.is_empty_element:
+        piece = str(el)
+        parts.append(piece)
+        return budget - len(piece)
+
+    # Render the tag without its children to get its opening and closing markup
+    shallow = Tag(name=el.name, prefix=el.prefix, attrs=el.attrs, can_be_empty_element=False)
+    closing = f"</{el.prefix + ':' if el.prefix else ''}{el.name}>"
+    opening = str(shallow)[:-len(closing)]
+    parts.append(opening)
+    budget -= len(opening)
+
+    for child in el.contents:
+        if budget <= 0:
+            return budget
+        if isinstance(child, Tag):
+            budget = _write_prefix(child, parts, budget)
+        else:
+            piece = child.output_ready()
+            parts.append(piece)
+            budget -= len(piece)
+
+    if budget > 0:
+        parts.append(closing)
+        budget -= len(closing)
+    return budget
 
 
 # =============================================================================
@@ -82,32 +188,32 @@ class AltTextAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect missing alt text on images and linked images"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
         # Images must have alt
-        for img in soup.find_all("img"):
+        for img in index.tags("img"):
             alt = img.get("alt")
             if alt is None or (isinstance(alt, str) and not alt.strip()):
                 issues.append({
                     "code": "IMG_MISSING_ALT",
                     "message": "Image element missing descriptive alt text.",
-                    "context": str(img)[:200],
+                    "context": _snippet(img),
                 })
 
         # Links with images should have alt text
-        for a in soup.find_all("a"):
-            text = a.get_text(strip=True)
-            if not text:
-                imgs = a.find_all("img")
-                if imgs:
-                    first_alt = imgs[0].get("alt") or ""
+        # Link text is shared with LinkTextAnalyzer through the index
+        for a in index.tags("a"):
+            if not index.text(a):
+                img = a.find("img")
+                if img is not None:
+                    first_alt = img.get("alt") or ""
                     if not first_alt.strip():
                         issues.append({
                             "code": "LINK_IMG_MISSING_ALT",
                             "message": "Link contains image(s) without alt text.",
-                            "context": str(a)[:200],
+                            "context": _snippet(a),
                         })
 
         return issues
@@ -124,17 +230,18 @@ class FormLabelAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect form controls without accessible labels"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
+        labelled_ids = {label.get("for") for label in index.tags("label")}
 
-        for control in soup.find_all(["input", "textarea", "select"]):
+        for control in index.tags("input", "textarea", "select"):
             ctype = (control.get("type") or "").lower()
             if ctype in ("hidden", "submit", "button", "image", "reset"):
                 continue
             has_label = False
             id_ = control.get("id")
-            if id_ and soup.find("label", attrs={"for": id_}):
+            if id_ and id_ in labelled_ids:
                 has_label = True
             if control.get("aria-label") or control.get("aria-labelledby"):
                 has_label = True
@@ -147,7 +254,7 @@ class FormLabelAnalyzer(Analyzer):
                 issues.append({
                     "code": "FORM_CONTROL_NO_LABEL",
                     "message": "Form control is missing an accessible label.",
-                    "context": str(control)[:200],
+                    "context": _snippet(control),
                 })
 
         return issues
@@ -164,22 +271,20 @@ class HeadingOrderAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect heading level jumps that confuse screen readers"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
-        headings = [int(tag.name[1]) for tag in soup.find_all(re.compile(r"^h[1-6]$"))]
-        if headings:
-            prev = headings[0]
-            for h in headings[1:]:
-                if h - prev > 1:
-                    issues.append({
-                        "code": "HEADING_ORDER",
-                        "message": f"Heading level jumps from h{prev} to h{h} (may confuse screen readers).",
-                        "context": f"sequence: {headings[:20]}",
-                    })
-                    break
-                prev = h
+        headings = [int(tag.name[1]) for tag in index.tags(*HEADING_TAGS)]
+        # Only the first jump is reported
+        jump = next(((prev, h) for prev, h in pairwise(headings) if h - prev > 1), None)
+        if jump is not None:
+            prev, h = jump
+            issues.append({
+                "code": "HEADING_ORDER",
+                "message": f"Heading level jumps from h{prev} to h{h} (may confuse screen readers).",
+                "context": f"sequence: {headings[:20]}",
+            })
 
         return issues
 
@@ -191,15 +296,15 @@ class ContrastAnalyzer(Analyzer):
     WCAG_AA_THRESHOLD = 4.5
     WCAG_AAA_THRESHOLD = 7.0
 
-    # Named colors to hex mapping (common colors)
-    NAMED_COLORS: Dict[str, str] = {
-        "white": "#ffffff", "black": "#000000", "red": "#ff0000",
-        "green": "#008000", "blue": "#0000ff", "yellow": "#ffff00",
-        "cyan": "#00ffff", "magenta": "#ff00ff", "gray": "#808080",
-        "grey": "#808080", "silver": "#c0c0c0", "maroon": "#800000",
-        "olive": "#808000", "lime": "#00ff00", "aqua": "#00ffff",
-        "teal": "#008080", "navy": "#000080", "fuchsia": "#ff00ff",
-        "purple": "#800080", "orange": "#ffa500", "pink": "#ffc0cb",
+    # Named colors to (r, g, b) mapping (common colors)
+    NAMED_COLORS: Dict[str, Tuple[int, int, int]] = {
+        "white": (255, 255, 255), "black": (0, 0, 0), "red": (255, 0, 0),
+        "green": (0, 128, 0), "blue": (0, 0, 255), "yellow": (255, 255, 0),
+        "cyan": (0, 255, 255), "magenta": (255, 0, 255), "gray": (128, 128, 128),
+        "grey": (128, 128, 128), "silver": (192, 192, 192), "maroon": (128, 0, 0),
+        "olive": (128, 128, 0), "lime": (0, 255, 0), "aqua": (0, 255, 255),
+        "teal": (0, 128, 128), "navy": (0, 0, 128), "fuchsia": (255, 0, 255),
+        "purple": (128, 0, 128), "orange": (255, 165, 0), "pink": (255, 192, 203),
     }
 
     @property
@@ -210,110 +315,101 @@ class ContrastAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect low contrast in inline style colors"
 
-    def _parse_color(self, value: str) -> Optional[str]:
-        """Parse color value to hex format."""
+    # Pure color helpers, memoized: themed pages repeat a few inline colors
+    # on many elements
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_color(value: str) -> Optional[Tuple[int, int, int]]:
+        """Parse color value to an (r, g, b) tuple."""
         if not value:
             return None
         v = value.strip().lower()
 
         # Named color
-        if v in self.NAMED_COLORS:
-            return self.NAMED_COLORS[v]
+        named = ContrastAnalyzer.NAMED_COLORS
+        if v in named:
+            return named[v]
+
+        m = _COLOR_RE.match(v)
+        if not m:
+            return None
 
         # Hex format
-        m = re.match(r"#([0-9a-fA-F]{3,6})", v)
-        if m:
-            hexv = m.group(0)
-            if len(m.group(1)) == 3:
-                h = m.group(1)
-                hexv = "#" + "".join([c * 2 for c in h])
-            return hexv.lower()
+        h = m.group("hex")
+        if h:
+            if len(h) == 3:
+                h = "".join([c * 2 for c in h])
+            if len(h) != 6:
+                return None
+            return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
 
         # RGB/RGBA format
-        m = re.match(r"rgba?\(([^)]+)\)", v)
-        if m:
+        args = m.group("rgb")
+        if args:
             try:
-                parts = [int(p.strip().split("%")[0]) for p in m.group(1).split(",")[:3]]
-                return "#%02x%02x%02x" % tuple(parts)
+                r, g, b = [int(p.strip().split("%")[0]) for p in args.split(",")[:3]]
+                return _clamp_rgb(r, g, b)
             except Exception:
-                pass
+                return None
 
         # HSL format (basic support)
-        m = re.match(r"hsla?\(([^)]+)\)", v)
-        if m:
-            try:
-                parts = m.group(1).split(",")
-                h = float(parts[0].strip()) / 360
-                s = float(parts[1].strip().replace("%", "")) / 100
-                lum = float(parts[2].strip().replace("%", "")) / 100
-                # HSL to RGB conversion
-                if s == 0:
-                    r = g = b = int(lum * 255)
-                else:
-                    def hue_to_rgb(p, q, t):
-                        if t < 0:
-                            t += 1
-                        if t > 1:
-                            t -= 1
-                        if t < 1/6:
-                            return p + (q - p) * 6 * t
-                        if t < 1/2:
-                            return q
-                        if t < 2/3:
-                            return p + (q - p) * (2/3 - t) * 6
-                        return p
-
-                    q = lum * (1 + s) if lum < 0.5 else lum + s - lum * s
-                    p = 2 * lum - q
-                    r = int(hue_to_rgb(p, q, h + 1/3) * 255)
-                    g = int(hue_to_rgb(p, q, h) * 255)
-                    b = int(hue_to_rgb(p, q, h - 1/3) * 255)
-                return "#%02x%02x%02x" % (r, g, b)
-            except Exception:
-                pass
+        try:
+            parts = m.group("hsl").split(",")
+            h = float(parts[0].strip()) / 360
+            s = float(parts[1].strip().replace("%", "")) / 100
+            lum = float(parts[2].strip().replace("%", "")) / 100
+            r, g, b = (int(c * 255) for c in colorsys.hls_to_rgb(h, lum, s))
+            return _clamp_rgb(r, g, b)
+        except Exception:
+            pass
 
         return None
 
-    def _hex_to_rgb(self, hexstr: str) -> tuple:
-        h = hexstr.lstrip("#")
-        return tuple(int(h[i : i + 2], 16) for i in (0, 2, 4))
-
-    def _relative_luminance(self, rgb: tuple) -> float:
-        def chan(c):
-            s = c / 255.0
-            return s / 12.92 if s <= 0.03928 else ((s + 0.055) / 1.055) ** 2.4
-
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _relative_luminance(rgb: Tuple[int, int, int]) -> float:
+        lin = _SRGB_LINEAR
         r, g, b = rgb
-        return 0.2126 * chan(r) + 0.7152 * chan(g) + 0.0722 * chan(b)
+        return 0.2126 * lin[r] + 0.7152 * lin[g] + 0.0722 * lin[b]
 
-    def _contrast_ratio(self, hex1: str, hex2: str) -> float:
-        l1 = self._relative_luminance(self._hex_to_rgb(hex1))
-        l2 = self._relative_luminance(self._hex_to_rgb(hex2))
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _contrast_ratio_sorted(rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int]) -> float:
+        l1 = ContrastAnalyzer._relative_luminance(rgb1)
+        l2 = ContrastAnalyzer._relative_luminance(rgb2)
         lighter = max(l1, l2)
         darker = min(l1, l2)
         return (lighter + 0.05) / (darker + 0.05)
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def _contrast_ratio(self, rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int]) -> float:
+        # The ratio is symmetric; order the pair so (a, b) and (b, a) share a cache entry
+        if rgb2 < rgb1:
+            rgb1, rgb2 = rgb2, rgb1
+        return self._contrast_ratio_sorted(rgb1, rgb2)
+
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
-        for el in soup.find_all(True):
+        for el in index.with_style:
             style = el.get("style")
             if not style:
                 continue
 
+            # Both a foreground and a background are needed for a ratio
+            if "color" not in style.lower():
+                continue
+
             color = None
             bgcolor = None
 
-            for part in style.split(";"):
-                if ":" not in part:
-                    continue
-                k, v = part.split(":", 1)
-                k = k.strip().lower()
+            for k, v in _COLOR_DECL_RE.findall(style):
+                k = k.lower()
                 v = v.strip()
                 if k == "color":
                     color = self._parse_color(v)
-                if k in ("background-color", "background"):
+                else:
                     bgcolor = self._parse_color(v)
 
             if color and bgcolor:
@@ -324,7 +420,7 @@ class ContrastAnalyzer(Analyzer):
                             "code": "LOW_CONTRAST",
                             "message": f"Low contrast ratio ({ratio:.2f}:1): text may be hard to read. "
                                       f"WCAG AA requires at least {self.WCAG_AA_THRESHOLD}:1.",
-                            "context": str(el)[:200],
+                            "context": _snippet(el),
                         })
                 except Exception:
                     pass
@@ -343,29 +439,23 @@ class LinkTextAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect links missing accessible text"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
-        for a in soup.find_all("a"):
-            # Check for accessible name
-            text = a.get_text(strip=True)
-            aria_label = a.get("aria-label", "").strip()
-            aria_labelledby = a.get("aria-labelledby", "").strip()
-            title = a.get("title", "").strip()
-
-            has_accessible_name = bool(text or aria_label or aria_labelledby or title)
+        for a in index.tags("a"):
+            # Check for accessible name; attributes first, text only if needed
+            has_accessible_name = _has_label_attr(a.attrs) or bool(index.text(a))
 
             if not has_accessible_name:
                 # Check for images with alt
-                imgs = a.find_all("img")
-                if imgs:
+                if a.find("img") is not None:
                     # If there are images, alt_text analyzer handles this
                     continue
                 issues.append({
                     "code": "LINK_NO_TEXT",
                     "message": "Link has no accessible name (no text and no labelled content).",
-                    "context": str(a)[:200],
+                    "context": _snippet(a),
                 })
 
         return issues
@@ -387,11 +477,11 @@ class LanguageAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect missing or invalid lang attribute on HTML element"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
-        html_tag = soup.find("html")
+        html_tag = index.first("html")
         if html_tag:
             lang = html_tag.get("lang", "").strip()
             if not lang:
@@ -399,17 +489,17 @@ class LanguageAnalyzer(Analyzer):
                     "code": "MISSING_LANG",
                     "message": "HTML element is missing the 'lang' attribute. "
                               "Screen readers use this to determine pronunciation.",
-                    "context": str(html_tag)[:100],
+                    "context": _snippet(html_tag, 100),
                 })
             else:
                 # Validate language code (check primary subtag)
-                primary_lang = lang.split("-")[0].lower()
+                primary_lang = lang.partition("-")[0].lower()
                 if primary_lang not in VALID_LANG_CODES:
                     issues.append({
                         "code": "INVALID_LANG",
                         "message": f"Invalid language code '{lang}'. "
                                   "Use a valid ISO 639-1 language code.",
-                        "context": str(html_tag)[:100],
+                        "context": _snippet(html_tag, 100),
                     })
 
         return issues
@@ -426,61 +516,52 @@ class ButtonAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect buttons without accessible names"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
         # Check <button> elements
-        for button in soup.find_all("button"):
+        for button in index.tags("button"):
             if not self._has_accessible_name(button):
                 issues.append({
                     "code": "BUTTON_NO_TEXT",
                     "message": "Button element has no accessible name.",
-                    "context": str(button)[:200],
+                    "context": _snippet(button),
                 })
 
         # Check <input type="button"> and <input type="submit">
-        for inp in soup.find_all("input", type=["button", "submit", "reset"]):
-            value = inp.get("value", "").strip()
-            aria_label = inp.get("aria-label", "").strip()
-            aria_labelledby = inp.get("aria-labelledby", "").strip()
-            title = inp.get("title", "").strip()
+        for inp in index.tags("input"):
+            if inp.get("type") not in ("button", "submit", "reset"):
+                continue
 
-            if not any([value, aria_label, aria_labelledby, title]):
+            if not _has_label_attr(inp.attrs, _INPUT_NAME_ATTRS):
                 # Submit buttons have default text, so only flag if explicitly empty
                 if inp.get("type") != "submit" or inp.get("value") == "":
                     issues.append({
                         "code": "BUTTON_NO_TEXT",
                         "message": f"Input type='{inp.get('type')}' has no accessible name.",
-                        "context": str(inp)[:200],
+                        "context": _snippet(inp),
                     })
 
         # Check elements with role="button"
-        for el in soup.find_all(attrs={"role": "button"}):
+        for el in index.with_role_value("button"):
             if not self._has_accessible_name(el):
                 issues.append({
                     "code": "BUTTON_NO_TEXT",
                     "message": "Element with role='button' has no accessible name.",
-                    "context": str(el)[:200],
+                    "context": _snippet(el),
                 })
 
         return issues
 
     def _has_accessible_name(self, element: Tag) -> bool:
         """Check if element has an accessible name."""
-        # Text content
-        text = element.get_text(strip=True)
-        if text:
-            return True
-
-        # ARIA attributes
-        if element.get("aria-label", "").strip():
-            return True
-        if element.get("aria-labelledby", "").strip():
+        # ARIA attributes or title; checked before the costlier text extraction
+        if _has_label_attr(element.attrs):
             return True
 
-        # Title attribute
-        if element.get("title", "").strip():
+        # Text content
+        if element.get_text(strip=True):
             return True
 
         # Image with alt inside button
@@ -502,12 +583,12 @@ class DocumentStructureAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect document structure issues (missing landmarks, multiple h1, etc.)"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
         # Check for missing <title>
-        title = soup.find("title")
+        title = index.first("title")
         if not title or not title.get_text(strip=True):
             issues.append({
                 "code": "MISSING_TITLE",
@@ -517,8 +598,8 @@ class DocumentStructureAnalyzer(Analyzer):
             })
 
         # Check for missing <main> landmark
-        main = soup.find("main")
-        main_role = soup.find(attrs={"role": "main"})
+        main = index.first("main")
+        main_role = index.with_role_value("main")
         if not main and not main_role:
             issues.append({
                 "code": "MISSING_MAIN",
@@ -528,13 +609,13 @@ class DocumentStructureAnalyzer(Analyzer):
             })
 
         # Check for multiple <h1> elements
-        h1_elements = soup.find_all("h1")
+        h1_elements = index.tags("h1")
         if len(h1_elements) > 1:
             issues.append({
                 "code": "MULTIPLE_H1",
                 "message": f"Page has {len(h1_elements)} <h1> elements. "
                           "Best practice is to have one h1 per page.",
-                "context": ", ".join(str(h)[:50] for h in h1_elements[:3]),
+                "context": ", ".join(_snippet(h, 50) for h in h1_elements[:3]),
             })
 
         # Check for missing h1
@@ -560,33 +641,43 @@ class TableAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect table accessibility issues (missing headers, captions)"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
-        for table in soup.find_all("table"):
+        for table in index.tags("table"):
             # Skip layout tables (tables with role="presentation" or role="none")
             role = table.get("role", "").lower()
             if role in ("presentation", "none"):
                 continue
 
+            # Rows, header cells and the caption, collected in one subtree walk
+            row_count = 0
+            headers = []
+            caption = None
+            for el in table.find_all(["tr", "th", "caption"]):
+                name = el.name
+                if name == "tr":
+                    row_count += 1
+                elif name == "th":
+                    headers.append(el)
+                elif caption is None:
+                    caption = el
+
             # Check if it's likely a data table (has th or more than 1 row)
-            rows = table.find_all("tr")
-            if len(rows) <= 1:
+            if row_count <= 1:
                 continue  # Probably not a data table
 
             # Check for headers
-            headers = table.find_all("th")
             if not headers:
                 issues.append({
                     "code": "TABLE_NO_HEADERS",
                     "message": "Data table is missing header cells (<th>). "
                               "Headers help screen reader users understand table structure.",
-                    "context": str(table)[:200],
+                    "context": _snippet(table),
                 })
 
             # Check for caption or accessible name
-            caption = table.find("caption")
             aria_label = table.get("aria-label", "").strip()
             aria_labelledby = table.get("aria-labelledby", "").strip()
             summary = table.get("summary", "").strip()  # Deprecated but still valid
@@ -596,7 +687,7 @@ class TableAnalyzer(Analyzer):
                     "code": "TABLE_NO_CAPTION",
                     "message": "Data table is missing a caption or accessible name. "
                               "Use <caption> or aria-label to describe the table.",
-                    "context": str(table)[:200],
+                    "context": _snippet(table),
                 })
 
             # Check for scope on headers
@@ -608,7 +699,7 @@ class TableAnalyzer(Analyzer):
                         "code": "TABLE_MISSING_SCOPE",
                         "message": "Table header is missing 'scope' attribute. "
                                   "Use scope='col' or scope='row' to clarify header relationships.",
-                        "context": str(th)[:200],
+                        "context": _snippet(th),
                     })
                     break  # Only report once per table
 
@@ -626,43 +717,68 @@ class ARIAAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect ARIA usage issues (invalid roles, aria-hidden on focusable)"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
         # Check for invalid ARIA roles
-        for el in soup.find_all(attrs={"role": True}):
+        for el in index.with_role:
             role = el.get("role", "").strip().lower()
             if role and role not in VALID_ARIA_ROLES:
                 issues.append({
                     "code": "INVALID_ARIA_ROLE",
                     "message": f"Invalid ARIA role '{role}'. Use a valid WAI-ARIA role.",
-                    "context": str(el)[:200],
+                    "context": _snippet(el),
                 })
 
         # Check for aria-hidden="true" on focusable elements
-        for el in soup.find_all(attrs={"aria-hidden": "true"}):
+        hidden = index.aria_hidden
+        contains_focusable = self._hidden_with_focusable_descendants(hidden) if hidden else set()
+        for el in hidden:
             if self._is_focusable(el):
                 issues.append({
                     "code": "ARIA_HIDDEN_FOCUSABLE",
                     "message": "Element with aria-hidden='true' is focusable. "
                               "This creates a confusing experience for keyboard users.",
-                    "context": str(el)[:200],
+                    "context": _snippet(el),
                 })
 
-            # Check for focusable descendants
-            for child in el.find_all(True):
-                if self._is_focusable(child):
-                    issues.append({
-                        "code": "ARIA_HIDDEN_FOCUSABLE",
-                        "message": "Element with aria-hidden='true' contains focusable content. "
-                                  "Keyboard users can focus invisible elements.",
-                        "context": str(el)[:200],
-                    })
-                    break  # Only report once per aria-hidden element
+            # Only report once per aria-hidden element
+            if id(el) in contains_focusable:
+                issues.append({
+                    "code": "ARIA_HIDDEN_FOCUSABLE",
+                    "message": "Element with aria-hidden='true' contains focusable content. "
+                              "Keyboard users can focus invisible elements.",
+                    "context": _snippet(el),
+                })
 
         return issues
 
+    def _hidden_with_focusable_descendants(self, hidden: List[Tag]) -> Set[int]:
+        """ids of the `hidden` elements that have a focusable descendant.
+
+        Each outermost hidden subtree is walked once; nested hidden elements
+        are resolved by walking up from the focusable nodes found, instead of
+        rescanning every nested subtree.
+        """
+        hidden_ids = {id(el) for el in hidden}
+        found: Set[int] = set()
+        for el in hidden:
+            if any(id(parent) in hidden_ids for parent in el.parents):
+                continue  # covered by the walk of an enclosing hidden element
+            for child in el.find_all(True):
+                if not self._is_focusable(child):
+                    continue
+                for parent in child.parents:
+                    pid = id(parent)
+                    if pid in found:
+                        break  # this ancestor chain was already marked
+                    if pid in hidden_ids:
+                        found.add(pid)
+                    if parent is el:
+                        break
+        return found
+
     def _is_focusable(self, element: Tag) -> bool:
         """Check if element is focusable."""
         # Inherently focusable elements
@@ -702,39 +818,27 @@ class SkipLinkAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect missing or broken skip navigation links"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
         # Look for skip links (typically first links in the document)
-        body = soup.find("body")
+        body = index.first("body")
         if not body:
             return issues
 
-        # Common skip link patterns
-        skip_link_patterns = [
-            r"skip.*main",
-            r"skip.*content",
-            r"skip.*nav",
-            r"jump.*content",
-            r"jump.*main",
-        ]
-
-        # Find all links
-        links = body.find_all("a", href=True)
+        # Only the first 10 links are checked
+        links = body.find_all("a", href=True, limit=10)
         skip_link_found = False
 
-        for link in links[:10]:  # Check first 10 links
+        for link in links:
             href = link.get("href", "")
-            text = link.get_text(strip=True).lower()
+            text = index.text(link).lower()
             aria_label = link.get("aria-label", "").lower()
 
             # Check if this looks like a skip link
             combined_text = f"{text} {aria_label}"
-            is_skip_link = any(
-                re.search(pattern, combined_text, re.I)
-                for pattern in skip_link_patterns
-            )
+            is_skip_link = _SKIP_LINK_RE.search(combined_text) is not None
 
             if is_skip_link or href.startswith("#main") or href.startswith("#content"):
                 skip_link_found = True
@@ -742,20 +846,22 @@ class SkipLinkAnalyzer(Analyzer):
                 # Check if target exists
                 if href.startswith("#"):
                     target_id = href[1:]
-                    target = soup.find(id=target_id)
+                    target = index.ids.get(target_id)
                     if not target:
                         issues.append({
                             "code": "BROKEN_SKIP_LINK",
                             "message": f"Skip link target '#{target_id}' does not exist.",
-                            "context": str(link)[:200],
+                            "context": _snippet(link),
                         })
                 break
 
         # Only flag missing skip link if page has navigation
-        nav = body.find("nav") or body.find(attrs={"role": "navigation"})
-        if nav and not skip_link_found:
+        if skip_link_found:
+            return issues
+        nav = _first_within(body, index.tags("nav")) or _first_within(body, index.with_role_value("navigation"))
+        if nav:
             # Check if there's significant content before main
-            main = body.find("main") or body.find(attrs={"role": "main"})
+            main = _first_within(body, index.tags("main")) or _first_within(body, index.with_role_value("main"))
             if main:
                 issues.append({
                     "code": "NO_SKIP_LINK",
@@ -778,12 +884,12 @@ class MediaAnalyzer(Analyzer):
     def description(self) -> str:
         return "Detect media accessibility issues (missing captions, transcripts)"
 
-    def analyze(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def analyze(self, html: str, tree: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
+        index = tag_index(parse_html(html) if tree is None else tree)
         issues = []
 
         # Check video elements
-        for video in soup.find_all("video"):
+        for video in index.tags("video"):
             # Check for captions track
             tracks = video.find_all("track")
             has_captions = any(
@@ -796,7 +902,7 @@ class MediaAnalyzer(Analyzer):
                     "code": "VIDEO_NO_CAPTIONS",
                     "message": "Video element is missing captions. "
                               "Add <track kind='captions'> for deaf/hard-of-hearing users.",
-                    "context": str(video)[:200],
+                    "context": _snippet(video),
                 })
 
             # Check for autoplay without controls
@@ -806,11 +912,11 @@ class MediaAnalyzer(Analyzer):
                         "code": "AUTOPLAY_NO_CONTROLS",
                         "message": "Video autoplays with sound but has no controls. "
                                   "Users cannot pause or mute the video.",
-                        "context": str(video)[:200],
+                        "context": _snippet(video),
                     })
 
         # Check audio elements
-        for audio in soup.find_all("audio"):
+        for audio in index.tags("audio"):
             # Note: We can't easily check for transcripts as they're usually in
             # surrounding content. Flag for manual review if no aria-describedby
             if not audio.get("aria-describedby"):
@@ -823,7 +929,7 @@ class MediaAnalyzer(Analyzer):
                         "code": "AUTOPLAY_NO_CONTROLS",
                         "message": "Audio autoplays with sound but has no controls. "
                                   "Users cannot pause or mute the audio.",
-                        "context": str(audio)[:200],
+                        "context": _snippet(audio),
                     })
 
         return issues
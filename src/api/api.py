@@ -9,9 +9,9 @@ from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.auth import OptionalAuth, is_auth_enabled
+from api.auth import OptionalAuth, clear_api_keys, is_auth_enabled
 from api.routes.dashboard import router as dashboard_router
-from api.routes.scan import router as scan_router
+from api.routes.scan import router as scan_router, shutdown_analyze_pool
 
 # Try to import version
 try:
@@ -25,6 +25,8 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     print(f"🚀 SiteAble API v{__version__} starting...")
+    # Drop keys looked up at import time, before the environment was final
+    clear_api_keys()
     if is_auth_enabled():
         print("🔐 API authentication is enabled")
     else:
@@ -32,6 +34,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("👋 SiteAble API shutting down...")
+    shutdown_analyze_pool()
 
 
 app = FastAPI(
@@ -5,7 +5,7 @@ Provides simple API key authentication for securing endpoints.
 
 import os
 import secrets
-from typing import Optional
+from typing import FrozenSet, Optional
 
 from fastapi import HTTPException, Security
 from fastapi.security import APIKeyHeader
@@ -15,23 +15,44 @@ API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 # Load valid API keys from environment
 # Format: comma-separated list of keys
-_VALID_API_KEYS = set()
 
 
-def _load_api_keys() -> set:
+def _load_api_keys() -> FrozenSet[str]:
     """Load valid API keys from environment."""
     keys_str = os.environ.get("SITEABLE_API_KEYS", "")
-    if keys_str:
-        return {k.strip() for k in keys_str.split(",") if k.strip()}
-    return set()
+    return frozenset(k.strip() for k in keys_str.split(",") if k.strip())
 
 
-def get_api_keys() -> set:
-    """Get the set of valid API keys."""
-    global _VALID_API_KEYS
-    if not _VALID_API_KEYS:
-        _VALID_API_KEYS = _load_api_keys()
-    return _VALID_API_KEYS
+# Keys read on first lookup; the app refreshes them at startup, once the
+# environment is final
+_api_keys: Optional[FrozenSet[str]] = None
+
+
+def get_api_keys() -> FrozenSet[str]:
+    """Get the set of valid API keys, read from the environment once.
+
+    Call `clear_api_keys()` after changing SITEABLE_API_KEYS.
+    """
+    global _api_keys
+    if _api_keys is None:
+        _api_keys = _load_api_keys()
+    return _api_keys
+
+
+def clear_api_keys() -> None:
+    """Forget the cached API keys so the next lookup reads the environment."""
+    global _api_keys
+    _api_keys = None
+
+
+def _is_valid_key(api_key: str) -> bool:
+    """Check `api_key` against every configured key in constant time."""
+    candidate = api_key.encode("utf-8")
+    valid = False
+    # No early exit, so timing does not reveal which or how many keys matched
+    for key in get_api_keys():
+        valid |= secrets.compare_digest(candidate, key.encode("utf-8"))
+    return valid
 
 
 def is_auth_enabled() -> bool:
@@ -63,7 +84,7 @@ async def verify_api_key(api_key: Optional[str] = Security(API_KEY_HEADER)) -> O
             detail="API key is required. Provide it in the X-API-Key header.",
         )
 
-    if api_key not in get_api_keys():
+    if not _is_valid_key(api_key):
         raise HTTPException(
             status_code=403,
             detail="Invalid API key.",
@@ -101,7 +122,7 @@ def require_auth(api_key: Optional[str] = Security(API_KEY_HEADER)) -> str:
             detail="API key is required.",
         )
 
-    if api_key not in get_api_keys():
+    if not _is_valid_key(api_key):
         raise HTTPException(
             status_code=403,
             detail="Invalid API key.",
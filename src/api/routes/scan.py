@@ -1,19 +1,45 @@
 """API routes for triggering and managing scans."""
 
 import asyncio
+import heapq
+import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel, HttpUrl
 
-# In-memory scan storage (in production, use Redis or database)
+# In-memory scan storage (in production, use Redis or database). Kept in
+# creation order and capped, dropping the oldest finished scans first
 _scans: Dict[str, dict] = {}
+_MAX_SCANS = int(os.environ.get("SITEABLE_MAX_SCANS", "1000"))
+
+# Worker processes for CPU-bound page analysis, so it neither stalls the
+# event loop nor shares one core under the GIL (0 = analyze in a thread)
+_ANALYZE_WORKERS = int(os.environ.get("SITEABLE_ANALYZE_WORKERS", os.cpu_count() or 1))
+_analyze_pool: Optional[ProcessPoolExecutor] = None
 
 router = APIRouter()
 
 
+def _get_analyze_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared analysis pool, starting it on first use."""
+    global _analyze_pool
+    if _analyze_pool is None and _ANALYZE_WORKERS > 0:
+        _analyze_pool = ProcessPoolExecutor(max_workers=_ANALYZE_WORKERS)
+    return _analyze_pool
+
+
+def shutdown_analyze_pool() -> None:
+    """Stop the shared analysis pool, if it was started, cancelling queued work."""
+    global _analyze_pool
+    if _analyze_pool is not None:
+        _analyze_pool.shutdown(cancel_futures=True)
+        _analyze_pool = None
+
+
 class ScanRequest(BaseModel):
     """Request body for starting a new scan."""
 
@@ -50,8 +76,8 @@ async def _run_scan(scan_id: str, request: ScanRequest) -> None:
     """Background task to run a scan."""
     from ai.accessibility.analyzer import analyze_html
     from ai.accessibility.utils import fetch_url
-    from core.severity import enrich_issues, summarize_by_severity
-    from crawler.crawler_scanner import scan_site
+    from core.severity import enrich_and_summarize, summarize_by_severity
+    from crawler.crawler_scanner import scan_site_enhanced
 
     _scans[scan_id]["status"] = "running"
     _scans[scan_id]["started_at"] = datetime.now().isoformat()
@@ -64,20 +90,29 @@ async def _run_scan(scan_id: str, request: ScanRequest) -> None:
             def on_progress(scanned: int, total: int, current_url: str):
                 _scans[scan_id]["pages_scanned"] = scanned
 
-            issues_map = scan_site(
+            # Awaited directly: this task already runs in the server's event
+            # loop, where the synchronous scan_site() wrapper cannot start one.
+            # Pages are analyzed in the pool shared with single-page scans
+            issues_map = await scan_site_enhanced(
                 url,
                 max_pages=request.max_pages,
                 concurrency=request.concurrency,
                 exclude_analyzers=request.exclude_analyzers,
+                on_progress=on_progress,
+                executor=_get_analyze_pool(),
             )
 
             # Process results
-            all_issues = []
+            total_issues = 0
             pages_results = {}
+            # Site totals are added up from the per-page counts
+            severity_summary = summarize_by_severity(())
 
             for page_url, issues in issues_map.items():
-                enriched = enrich_issues(issues)
-                all_issues.extend(enriched)
+                enriched, page_counts = enrich_and_summarize(issues)
+                total_issues += len(enriched)
+                for level, count in page_counts.items():
+                    severity_summary[level] += count
                 pages_results[page_url] = {
                     "issues": enriched,
                     "issue_count": len(enriched),
@@ -86,23 +121,31 @@ async def _run_scan(scan_id: str, request: ScanRequest) -> None:
             _scans[scan_id]["results"] = {
                 "pages": pages_results,
                 "total_pages": len(pages_results),
-                "total_issues": len(all_issues),
-                "severity_summary": summarize_by_severity(all_issues),
+                "total_issues": total_issues,
+                "severity_summary": severity_summary,
             }
             _scans[scan_id]["pages_scanned"] = len(pages_results)
-            _scans[scan_id]["total_issues"] = len(all_issues)
+            _scans[scan_id]["total_issues"] = total_issues
 
         else:
             # Single page scan
-            html = fetch_url(url)
-            issues = analyze_html(html, exclude_analyzers=request.exclude_analyzers)
-            enriched = enrich_issues(issues)
+            # The blocking fetch runs in a thread and the analysis in a worker
+            # process, so the event loop keeps serving other requests meanwhile
+            html = await asyncio.to_thread(fetch_url, url)
+            pool = _get_analyze_pool()
+            if pool is not None:
+                issues = await asyncio.get_running_loop().run_in_executor(
+                    pool, analyze_html, html, request.exclude_analyzers,
+                )
+            else:
+                issues = await asyncio.to_thread(analyze_html, html, request.exclude_analyzers)
+            enriched, severity_counts = enrich_and_summarize(issues)
 
             _scans[scan_id]["results"] = {
                 "url": url,
                 "issues": enriched,
                 "total_issues": len(enriched),
-                "severity_summary": summarize_by_severity(enriched),
+                "severity_summary": severity_counts,
             }
             _scans[scan_id]["pages_scanned"] = 1
             _scans[scan_id]["total_issues"] = len(enriched)
@@ -116,6 +159,19 @@ async def _run_scan(scan_id: str, request: ScanRequest) -> None:
         _scans[scan_id]["completed_at"] = datetime.now().isoformat()
 
 
+def _evict_finished_scans() -> None:
+    """Drop the oldest completed or failed scans while the store is over its cap."""
+    excess = len(_scans) - _MAX_SCANS
+    if excess <= 0:
+        return
+    finished = [
+        scan_id for scan_id, scan in _scans.items()
+        if scan.get("status") in ("completed", "failed")
+    ]
+    for scan_id in finished[:excess]:
+        del _scans[scan_id]
+
+
 @router.post("/scan", response_model=ScanResponse)
 async def create_scan(request: ScanRequest, background_tasks: BackgroundTasks):
     """Start a new accessibility scan.
@@ -135,6 +191,7 @@ async def create_scan(request: ScanRequest, background_tasks: BackgroundTasks):
         "results": None,
         "error": None,
     }
+    _evict_finished_scans()
 
     # Run scan in background
     background_tasks.add_task(_run_scan, scan_id, request)
@@ -158,10 +215,10 @@ async def get_scan_status(scan_id: str):
 @router.get("/scans", response_model=List[ScanStatus])
 async def list_scans(limit: int = 10):
     """List recent scans."""
-    scans = list(_scans.values())
-    # Sort by started_at descending
-    scans.sort(key=lambda x: x.get("started_at") or "", reverse=True)
-    return [ScanStatus(**s) for s in scans[:limit]]
+    # Most recently started first; nlargest keeps only `limit` entries
+    # instead of sorting the whole store
+    scans = heapq.nlargest(limit, _scans.values(), key=lambda x: x.get("started_at") or "")
+    return [ScanStatus(**s) for s in scans]
 
 
 @router.delete("/scan/{scan_id}")
@@ -1,5 +1,107 @@
+import inspect
+import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup, Tag
+
+logger = logging.getLogger("siteable.analyzer")
+
+# Raw HTML or a tree already parsed by the caller
+HTMLInput = Union[str, BeautifulSoup]
+
+
+def parse_html(html: HTMLInput) -> BeautifulSoup:
+    """Parse HTML with lxml, passing through an already parsed document."""
+    if isinstance(html, BeautifulSoup):
+        return html
+    return BeautifulSoup(html, "lxml")
+
+
+class TagIndex:
+    """Elements of a parsed document, collected in a single tree walk.
+
+    Built once per document by `tag_index()` and shared by every analyzer, so
+    whole-document lookups (all images, all elements with a role, ...) are
+    list reads instead of one `find_all` traversal per analyzer. Lists keep
+    document order.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        by_name: Dict[str, List[Tag]] = defaultdict(list)
+        with_style: List[Tag] = []
+        with_role: List[Tag] = []
+        aria_hidden: List[Tag] = []
+        ids: Dict[str, Tag] = {}
+        position: Dict[int, int] = {}
+
+        for pos, el in enumerate(soup.find_all(True)):
+            by_name[el.name].append(el)
+            position[id(el)] = pos
+            attrs = el.attrs
+            if not attrs:
+                continue
+            if "style" in attrs:
+                with_style.append(el)
+            if "role" in attrs:
+                with_role.append(el)
+            if attrs.get("aria-hidden") == "true":
+                aria_hidden.append(el)
+            el_id = attrs.get("id")
+            if el_id is not None and el_id not in ids:
+                ids[el_id] = el
+
+        self._by_name = by_name
+        self._position = position
+        self._texts: Dict[int, str] = {}
+        self.with_style = with_style
+        self.with_role = with_role
+        self.aria_hidden = aria_hidden
+        self.ids = ids
+
+    def tags(self, *names: str) -> List[Tag]:
+        """Elements with any of the given tag names, in document order."""
+        if len(names) == 1:
+            return self._by_name.get(names[0], [])
+        found = [el for name in names for el in self._by_name.get(name, ())]
+        position = self._position
+        found.sort(key=lambda el: position[id(el)])
+        return found
+
+    def first(self, name: str) -> Optional[Tag]:
+        """First element with this tag name, like `soup.find(name)`."""
+        found = self._by_name.get(name)
+        return found[0] if found else None
+
+    def text(self, el: Tag) -> str:
+        """`el.get_text(strip=True)`, computed once per element for all analyzers."""
+        key = id(el)
+        text = self._texts.get(key)
+        if text is None:
+            text = el.get_text(strip=True)
+            self._texts[key] = text
+        return text
+
+    def with_role_value(self, role: str) -> List[Tag]:
+        """Elements whose role attribute is exactly `role`."""
+        return [el for el in self.with_role if el.get("role") == role]
+
+
+def tag_index(soup: BeautifulSoup) -> TagIndex:
+    """Return the TagIndex for `soup`, building it on first use.
+
+    The index is stored on the tree itself, so it lives exactly as long
+    as the parsed document that all analyzers share.
+    """
+    # Read __dict__ directly: attribute access on a bs4 Tag falls back to a
+    # child-tag search
+    index = soup.__dict__.get("_tag_index")
+    if index is None:
+        index = TagIndex(soup)
+        soup.__dict__["_tag_index"] = index
+    return index
 
 
 class Analyzer(ABC):
@@ -19,24 +121,63 @@ class Analyzer(ABC):
 
     @abstractmethod
     def analyze(self, html: str) -> List[Dict[str, Any]]:
-        """Analyze HTML and return list of issues with keys: code, message, context."""
+        """Analyze HTML and return list of issues with keys: code, message, context.
+
+        `html` is always the raw page string. An analyzer can opt in to the
+        tree the registry parses once per page by accepting a `tree` keyword
+        (`analyze(self, html, tree=None)`); it then receives the shared
+        BeautifulSoup tree, which it must not modify, and `tag_index(tree)`
+        for whole-document element lookups.
+        """
         pass
 
+    def analyze_soup(self, soup: BeautifulSoup, html: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Analyze a page the caller has already parsed into `soup`.
+
+        This is what the registry calls. The default hands `soup` to
+        `analyze()` as its `tree` when the analyzer accepts one, and the
+        original `html` (or `str(soup)` if not given) otherwise; override it
+        to work on the tree directly.
+        """
+        if html is None:
+            html = str(soup)
+        if accepts_tree(self):
+            return self.analyze(html, tree=soup)
+        return self.analyze(html)
+
+
+@lru_cache(maxsize=None)
+def _analyze_takes_tree(cls: type) -> bool:
+    return "tree" in inspect.signature(cls.analyze).parameters
+
+
+def accepts_tree(analyzer: Analyzer) -> bool:
+    """Whether `analyzer.analyze` takes the shared parsed tree as a `tree` keyword."""
+    return _analyze_takes_tree(type(analyzer))
+
 
 class AnalyzerRegistry:
     """Registry to manage available analyzers."""
 
     def __init__(self):
         self._analyzers: Dict[str, Analyzer] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every registry change (lets callers cache lookups)."""
+        return self._version
 
     def register(self, analyzer: Analyzer) -> None:
         """Register an analyzer instance."""
         self._analyzers[analyzer.name] = analyzer
+        self._version += 1
 
     def unregister(self, name: str) -> None:
         """Unregister an analyzer by name."""
         if name in self._analyzers:
             del self._analyzers[name]
+            self._version += 1
 
     def get(self, name: str) -> Analyzer:
         """Get analyzer by name."""
@@ -46,18 +187,23 @@ class AnalyzerRegistry:
         """List all registered analyzers."""
         return dict(self._analyzers)
 
-    def analyze_all(self, html: str, exclude: List[str] = None) -> List[Dict[str, Any]]:
-        """Run all analyzers (except excluded) and return combined issues."""
-        exclude = exclude or []
-        issues = []
-        for name, analyzer in self._analyzers.items():
+    def iter_issues(self, html: str, exclude: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield issues from all analyzers (except excluded) as each one finishes."""
+        exclude = frozenset(exclude or ())
+        # Parse once and share the tree across analyzers
+        soup = parse_html(html)
+        for name, analyzer in list(self._analyzers.items()):
             if name not in exclude:
                 try:
-                    analyzer_issues = analyzer.analyze(html)
-                    issues.extend(analyzer_issues)
-                except Exception:
-                    pass
-        return issues
+                    analyzer_issues = analyzer.analyze_soup(soup, html)
+                except Exception as e:
+                    logger.warning(f"Analyzer {name} failed: {e}")
+                    continue
+                yield from analyzer_issues
+
+    def analyze_all(self, html: str, exclude: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Run all analyzers (except excluded) and return combined issues."""
+        return list(self.iter_issues(html, exclude))
 
 
 # Global registry instance
@@ -5,9 +5,9 @@ and command-line arguments with proper precedence.
 """
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 # Try to import yaml, fall back gracefully
 try:
@@ -53,7 +53,7 @@ class AIConfig:
 
     enabled: bool = False
     model: str = "gpt-3.5-turbo"
-    api_key: Optional[str] = None
+    api_key: Optional[str] = field(default=None, metadata={"serialize": False})
 
 
 @dataclass
@@ -76,81 +76,46 @@ class Config:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Config":
-        """Create Config from dictionary."""
-        config = cls()
-
-        if "scan" in data:
-            scan = data["scan"]
-            config.scan = ScanConfig(
-                concurrency=scan.get("concurrency", 10),
-                max_pages=scan.get("max_pages", 200),
-                delay=scan.get("delay", 0.0),
-                rate_limit=scan.get("rate_limit", 0.0),
-                timeout=scan.get("timeout", 10.0),
-                respect_robots=scan.get("respect_robots", True),
-            )
-
-        if "analyzers" in data:
-            analyzers = data["analyzers"]
-            config.analyzers = AnalyzerConfig(
-                exclude=analyzers.get("exclude", []),
-                wcag_level=analyzers.get("wcag_level", "AA"),
-            )
-
-        if "output" in data:
-            output = data["output"]
-            config.output = OutputConfig(
-                format=output.get("format", "pretty"),
-                path=output.get("path"),
-                html_path=output.get("html_path"),
-            )
+        """Create Config from dictionary.
 
-        if "ai" in data:
-            ai = data["ai"]
-            config.ai = AIConfig(
-                enabled=ai.get("enabled", False),
-                model=ai.get("model", "gpt-3.5-turbo"),
-                api_key=ai.get("api_key"),
-            )
+        Each known section is built from its dataclass fields; unknown
+        sections and keys are ignored.
+        """
+        config = cls()
 
-        if "database" in data:
-            db = data["database"]
-            config.database = DatabaseConfig(
-                path=db.get("path"),
-                auto_save=db.get("auto_save", False),
-            )
+        for section in fields(cls):
+            if section.name in data:
+                section_cls = type(getattr(config, section.name))
+                known = {f.name for f in fields(section_cls)}
+                values = {k: v for k, v in data[section.name].items() if k in known}
+                setattr(config, section.name, section_cls(**values))
 
         return config
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert Config to dictionary."""
-        return {
-            "scan": {
-                "concurrency": self.scan.concurrency,
-                "max_pages": self.scan.max_pages,
-                "delay": self.scan.delay,
-                "rate_limit": self.scan.rate_limit,
-                "timeout": self.scan.timeout,
-                "respect_robots": self.scan.respect_robots,
-            },
-            "analyzers": {
-                "exclude": self.analyzers.exclude,
-                "wcag_level": self.analyzers.wcag_level,
-            },
-            "output": {
-                "format": self.output.format,
-                "path": self.output.path,
-                "html_path": self.output.html_path,
-            },
-            "ai": {
-                "enabled": self.ai.enabled,
-                "model": self.ai.model,
-            },
-            "database": {
-                "path": self.database.path,
-                "auto_save": self.database.auto_save,
-            },
-        }
+        """Convert Config to dictionary, leaving out secrets such as API keys."""
+        result = {}
+        for section in fields(self):
+            value = getattr(self, section.name)
+            result[section.name] = {
+                f.name: getattr(value, f.name)
+                for f in fields(value)
+                if f.metadata.get("serialize", True)
+            }
+        return result
+
+
+def _find_config_file(directory: Path, names: Sequence[str]) -> Optional[Path]:
+    """Return the first of `names` that is a file in `directory`, if any."""
+    try:
+        with os.scandir(directory) as entries:
+            found = {entry.name for entry in entries if entry.name in names and entry.is_file()}
+    except OSError:
+        return None
+    for name in names:
+        if name in found:
+            return directory / name
+    return None
 
 
 def load_config(config_path: Optional[str] = None) -> Config:
@@ -167,25 +132,19 @@ def load_config(config_path: Optional[str] = None) -> Config:
     Returns:
         Config object with loaded settings
     """
-    paths_to_try = []
-
     if config_path:
-        paths_to_try.append(Path(config_path))
-    else:
-        # Current directory
-        paths_to_try.append(Path("siteable.yaml"))
-        paths_to_try.append(Path("siteable.yml"))
-        paths_to_try.append(Path(".siteable.yaml"))
-        paths_to_try.append(Path(".siteable.yml"))
-
-        # Home directory
-        home = Path.home()
-        paths_to_try.append(home / ".siteable" / "config.yaml")
-        paths_to_try.append(home / ".siteable" / "config.yml")
-
-    for path in paths_to_try:
+        path = Path(config_path)
         if path.exists():
             return load_config_from_file(path)
+    else:
+        # Current directory, then home directory; one directory listing each
+        # instead of a stat() per candidate name
+        names = ("siteable.yaml", "siteable.yml", ".siteable.yaml", ".siteable.yml")
+        path = _find_config_file(Path("."), names)
+        if path is None:
+            path = _find_config_file(Path.home() / ".siteable", ("config.yaml", "config.yml"))
+        if path is not None:
+            return load_config_from_file(path)
 
     # Return default config if no file found
     return Config()
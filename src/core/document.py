@@ -0,0 +1,34 @@
+"""lxml helpers shared by the lxml-based analyzer, fixer and crawlers."""
+
+from lxml import etree
+from lxml import html as lxml_html
+
+
+def parse_document(html: str):
+    """Parse HTML into an lxml document, or None if there is nothing to parse."""
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input carrying an XML encoding declaration
+        try:
+            return lxml_html.document_fromstring(html.encode("utf-8"))
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+def element_context(el, limit: int = 200) -> str:
+    """Short HTML snippet for an issue: the element's tag, attributes and leading text.
+
+    Children are left out so large subtrees are never serialized just to be cut.
+    """
+    try:
+        shallow = etree.Element(el.tag, dict(el.attrib))
+    except ValueError:
+        # Attribute names the HTML parser accepts but lxml cannot copy onto a
+        # new element (e.g. Vue/Alpine's @click, :class); serialize the element itself
+        return lxml_html.tostring(el, encoding="unicode", with_tail=False)[:limit]
+    if el.text:
+        shallow.text = el.text[:limit]
+    return lxml_html.tostring(shallow, encoding="unicode")[:limit]
@@ -3,7 +3,8 @@
 Maps issue codes to severity levels and WCAG criteria for better prioritization.
 """
 
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 # Severity levels
 CRITICAL = "critical"  # Blocks access for users with disabilities
@@ -12,7 +13,7 @@ MINOR = "minor"  # Usability issue, but workarounds exist
 
 
 # Mapping of issue codes to severity and WCAG criteria
-SEVERITY_MAP: Dict[str, Dict[str, str]] = {
+_SEVERITY_INFO: Dict[str, Dict[str, str]] = {
     # Critical - Completely blocks access
     "IMG_MISSING_ALT": {
         "level": CRITICAL,
@@ -144,9 +145,38 @@ SEVERITY_MAP: Dict[str, Dict[str, str]] = {
     },
 }
 
+# Read-only view: the table is never changed after import, and the tables
+# derived from it below rely on that
+SEVERITY_MAP: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {code: MappingProxyType(info) for code, info in _SEVERITY_INFO.items()}
+)
+
 # Priority order for sorting
 SEVERITY_ORDER = {CRITICAL: 0, MAJOR: 1, MINOR: 2}
 
+# Display lookups for CLI/HTML output
+SEVERITY_COLORS = {CRITICAL: "red", MAJOR: "yellow", MINOR: "blue"}
+SEVERITY_EMOJIS = {CRITICAL: "🔴", MAJOR: "🟡", MINOR: "🔵"}
+
+
+# Everything enrich_issue adds for a code, assembled once so an issue costs a
+# single lookup
+_ENRICHMENT: Dict[str, Dict[str, Optional[str]]] = {
+    code: {
+        "severity": info["level"],
+        "wcag": info["wcag"],
+        "wcag_name": info.get("wcag_name"),
+        "impact": info.get("impact"),
+    }
+    for code, info in SEVERITY_MAP.items()
+}
+_DEFAULT_ENRICHMENT: Dict[str, Optional[str]] = {
+    "severity": MINOR,  # Default to minor for unknown codes
+    "wcag": None,
+    "wcag_name": None,
+    "impact": None,
+}
+
 
 def get_severity(code: str) -> str:
     """Get severity level for an issue code.
@@ -157,9 +187,7 @@ def get_severity(code: str) -> str:
     Returns:
         Severity level ('critical', 'major', or 'minor')
     """
-    if code in SEVERITY_MAP:
-        return SEVERITY_MAP[code]["level"]
-    return MINOR  # Default to minor for unknown codes
+    return _ENRICHMENT.get(code, _DEFAULT_ENRICHMENT)["severity"]
 
 
 def get_wcag_criterion(code: str) -> Optional[str]:
@@ -171,9 +199,7 @@ def get_wcag_criterion(code: str) -> Optional[str]:
     Returns:
         WCAG criterion (e.g., '1.1.1') or None
     """
-    if code in SEVERITY_MAP:
-        return SEVERITY_MAP[code]["wcag"]
-    return None
+    return _ENRICHMENT.get(code, _DEFAULT_ENRICHMENT)["wcag"]
 
 
 def get_wcag_name(code: str) -> Optional[str]:
@@ -185,9 +211,7 @@ def get_wcag_name(code: str) -> Optional[str]:
     Returns:
         WCAG criterion name (e.g., 'Non-text Content') or None
     """
-    if code in SEVERITY_MAP:
-        return SEVERITY_MAP[code].get("wcag_name")
-    return None
+    return _ENRICHMENT.get(code, _DEFAULT_ENRICHMENT)["wcag_name"]
 
 
 def get_impact(code: str) -> Optional[str]:
@@ -199,9 +223,7 @@ def get_impact(code: str) -> Optional[str]:
     Returns:
         Impact description or None
     """
-    if code in SEVERITY_MAP:
-        return SEVERITY_MAP[code].get("impact")
-    return None
+    return _ENRICHMENT.get(code, _DEFAULT_ENRICHMENT)["impact"]
 
 
 def enrich_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
@@ -213,15 +235,7 @@ def enrich_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Enriched issue dict with severity, wcag, wcag_name, and impact
     """
-    code = issue.get("code", "")
-    enriched = issue.copy()
-
-    enriched["severity"] = get_severity(code)
-    enriched["wcag"] = get_wcag_criterion(code)
-    enriched["wcag_name"] = get_wcag_name(code)
-    enriched["impact"] = get_impact(code)
-
-    return enriched
+    return {**issue, **_ENRICHMENT.get(issue.get("code", ""), _DEFAULT_ENRICHMENT)}
 
 
 def enrich_issues(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -236,6 +250,28 @@ def enrich_issues(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [enrich_issue(issue) for issue in issues]
 
 
+def enrich_and_summarize(issues: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Enrich issues and count them by severity in a single pass.
+
+    Equivalent to `enrich_issues` followed by `summarize_by_severity`.
+
+    Args:
+        issues: Issue dicts
+
+    Returns:
+        Tuple of (enriched issue dicts, counts per severity level)
+    """
+    enriched = []
+    counts = {CRITICAL: 0, MAJOR: 0, MINOR: 0}
+    table = _ENRICHMENT
+    default = _DEFAULT_ENRICHMENT
+    for issue in issues:
+        extra = table.get(issue.get("code", ""), default)
+        enriched.append({**issue, **extra})
+        counts[extra["severity"]] += 1
+    return enriched, counts
+
+
 def sort_by_severity(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Sort issues by severity (critical first, then major, then minor).
 
@@ -245,17 +281,18 @@ def sort_by_severity(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Returns:
         Sorted list of issues
     """
-    return sorted(
-        issues,
-        key=lambda x: SEVERITY_ORDER.get(x.get("severity", MINOR), 2),
-    )
+    # Stable bucket sort: three fixed ranks, original order kept within each
+    buckets: Tuple[List[Dict[str, Any]], ...] = ([], [], [])
+    for issue in issues:
+        buckets[SEVERITY_ORDER.get(issue.get("severity", MINOR), 2)].append(issue)
+    return buckets[0] + buckets[1] + buckets[2]
 
 
-def summarize_by_severity(issues: List[Dict[str, Any]]) -> Dict[str, int]:
+def summarize_by_severity(issues: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     """Summarize issues by severity level.
 
     Args:
-        issues: List of issue dicts (should be enriched first)
+        issues: Issue dicts (should be enriched first); any iterable, read once
 
     Returns:
         Dict with counts per severity level
@@ -279,11 +316,7 @@ def get_severity_color(severity: str) -> str:
     Returns:
         Color name for rich/HTML
     """
-    return {
-        CRITICAL: "red",
-        MAJOR: "yellow",
-        MINOR: "blue",
-    }.get(severity, "white")
+    return SEVERITY_COLORS.get(severity, "white")
 
 
 def get_severity_emoji(severity: str) -> str:
@@ -295,8 +328,4 @@ def get_severity_emoji(severity: str) -> str:
     Returns:
         Emoji string
     """
-    return {
-        CRITICAL: "🔴",
-        MAJOR: "🟡",
-        MINOR: "🔵",
-    }.get(severity, "⚪")
+    return SEVERITY_EMOJIS.get(severity, "⚪")
@@ -6,9 +6,10 @@ a mapping of URL -> list of issues (as produced by ai.accessibility.analyzer.ana
 
 import asyncio
 import logging
-import re
 import time
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
@@ -21,6 +22,7 @@ from tenacity import (
 )
 
 from ai.accessibility.analyzer_plugin import analyze_html
+from core.document import parse_document
 from crawler.rate_limiter import RateLimiter
 
 logger = logging.getLogger("siteable.crawler")
@@ -88,6 +90,44 @@ async def _fetch_text(
         return None
 
 
+def _parse_robots(text: str) -> List[Dict[str, Any]]:
+    """Parse robots.txt into user-agent groups.
+
+    Each group has "user_agents", "disallow" and "crawl_delay" entries. Lines
+    are split on the first colon; field names compare case-insensitively.
+    """
+    groups = []
+    current = {"user_agents": [], "disallow": [], "crawl_delay": None}
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        field, sep, value = line.partition(":")
+        if not sep:
+            continue
+        field = field.lower()
+
+        if field == "user-agent":
+            if current["user_agents"] or current["disallow"] or current["crawl_delay"] is not None:
+                groups.append(current)
+                current = {"user_agents": [], "disallow": [], "crawl_delay": None}
+            current["user_agents"].append(value.strip())
+        elif field == "disallow":
+            current["disallow"].append(value.strip())
+        elif field == "crawl-delay":
+            try:
+                current["crawl_delay"] = float(value.strip())
+            except Exception:
+                pass
+
+    # Append last group
+    if current["user_agents"] or current["disallow"] or current["crawl_delay"] is not None:
+        groups.append(current)
+    return groups
+
+
 async def _fetch_robots(
     client: httpx.AsyncClient,
     base_url: str,
@@ -110,39 +150,7 @@ async def _fetch_robots(
     if not text:
         return [], 0.0
 
-    # Parse robots.txt into user-agent groups
-    groups = []
-    current = {"user_agents": [], "disallow": [], "crawl_delay": None}
-
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-
-        m_ua = re.match(r"User-agent:\s*(.*)", line, re.I)
-        if m_ua:
-            if current["user_agents"] or current["disallow"] or current["crawl_delay"] is not None:
-                groups.append(current)
-                current = {"user_agents": [], "disallow": [], "crawl_delay": None}
-            current["user_agents"].append(m_ua.group(1).strip())
-            continue
-
-        m_dis = re.match(r"Disallow:\s*(.*)", line, re.I)
-        if m_dis:
-            current["disallow"].append(m_dis.group(1).strip())
-            continue
-
-        m_cd = re.match(r"Crawl-delay:\s*(.*)", line, re.I)
-        if m_cd:
-            try:
-                current["crawl_delay"] = float(m_cd.group(1).strip())
-            except Exception:
-                pass
-            continue
-
-    # Append last group
-    if current["user_agents"] or current["disallow"] or current["crawl_delay"] is not None:
-        groups.append(current)
+    groups = _parse_robots(text)
 
     # Find best matching group
     chosen = None
@@ -204,10 +212,35 @@ async def _fetch_sitemap_urls(client: httpx.AsyncClient, base_url: str) -> List[
     return urls
 
 
+def _page_links(text: str) -> List[str]:
+    """Extract the href of every <a> element on a page, in document order.
+
+    Parses with lxml directly rather than building a BeautifulSoup tree: only
+    the attribute values are needed, and the analysis tree cannot be reused
+    because analysis may run in a worker process or be served from cache.
+
+    Args:
+        text: Page HTML
+
+    Returns:
+        List of raw href values (empty if the page cannot be parsed)
+    """
+    doc = parse_document(text)
+    if doc is None:
+        return []
+    return [str(href) for href in doc.xpath("//a/@href")]
+
+
+@lru_cache(maxsize=4096)
+def _netloc_of(url: str) -> str:
+    """Return the netloc of a URL (memoized; the same links recur across pages)."""
+    return urlparse(url).netloc
+
+
 def _same_domain(start_netloc: str, url: str) -> bool:
     """Check if URL is on the same domain."""
     try:
-        return urlparse(url).netloc == start_netloc
+        return _netloc_of(url) == start_netloc
     except Exception:
         return False
 
@@ -225,9 +258,12 @@ async def scan_site_enhanced(
     concurrency: int = 10,
     delay: float = 0.0,
     db_path: Optional[str] = None,
-    exclude_analyzers: Optional[List[str]] = None,
+    exclude_analyzers: Optional[Iterable[str]] = None,
     rate_limit: float = 0.0,
     on_progress: Optional[Callable[[int, int, str], None]] = None,
+    on_page: Optional[Callable[[str, str, List[Dict[str, Any]]], None]] = None,
+    analysis_workers: int = 0,
+    executor: Optional[Executor] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """Crawl same-domain pages (polite) and analyze each page.
 
@@ -240,21 +276,40 @@ async def scan_site_enhanced(
         exclude_analyzers: List of analyzer names to skip
         rate_limit: Maximum requests per second (0 = unlimited)
         on_progress: Optional callback (pages_scanned, total_found, current_url)
+        on_page: Optional callback (url, html, issues) for each fetched page, so
+            callers can reuse the downloaded HTML instead of fetching it again
+        analysis_workers: Number of worker processes that analyze pages while
+            the crawl keeps fetching (0 = analyze in the event loop)
+        executor: Optional existing executor to analyze pages in, e.g. a pool
+            shared across scans; it is left running when the crawl ends and
+            takes precedence over analysis_workers
 
     Returns:
         Dictionary mapping URLs to lists of issues
     """
     start_parsed = urlparse(start_url)
     start_netloc = start_parsed.netloc
+    # Built once for the crawl instead of per analyzed page
+    excluded_analyzers = frozenset(exclude_analyzers or ())
 
     seen: Set[str] = set()
     to_visit: asyncio.Queue = asyncio.Queue()
+    # URLs currently waiting in to_visit, for O(1) duplicate checks
+    queued: Set[str] = set()
     issues_map: Dict[str, List[Dict]] = {}
     total_found = 0
 
     # Initialize rate limiter
     rate_limiter = RateLimiter(rate_limit) if rate_limit > 0 else None
 
+    # Analysis is CPU-bound; in worker processes it no longer holds up the
+    # event loop, so other workers keep fetching while pages are analyzed
+    analysis_pool = executor
+    owns_pool = analysis_pool is None and analysis_workers > 0
+    if owns_pool:
+        analysis_pool = ProcessPoolExecutor(max_workers=analysis_workers)
+    loop = asyncio.get_running_loop()
+
     headers = {
         "User-Agent": "SiteAble-Scanner/1.0 (+https://github.com/ghyathmoussa/SiteAble)",
     }
@@ -269,11 +324,13 @@ async def scan_site_enhanced(
 
         # Seed queue
         await to_visit.put(start_url)
+        queued.add(start_url)
         total_found = 1
 
         for s in sitemap_urls:
             if _same_domain(start_netloc, s) and s not in seen:
                 await to_visit.put(s)
+                queued.add(s)
                 total_found += 1
 
         sem = asyncio.Semaphore(concurrency)
@@ -286,6 +343,7 @@ async def scan_site_enhanced(
                     url = await asyncio.wait_for(to_visit.get(), timeout=2.0)
                 except asyncio.TimeoutError:
                     break
+                queued.discard(url)
 
                 if url in seen:
                     to_visit.task_done()
@@ -318,7 +376,12 @@ async def scan_site_enhanced(
 
                     # Analyze
                     try:
-                        issues = analyze_html(text, exclude_analyzers=exclude_analyzers)
+                        if analysis_pool is not None:
+                            issues = await loop.run_in_executor(
+                                analysis_pool, analyze_html, text, excluded_analyzers,
+                            )
+                        else:
+                            issues = analyze_html(text, exclude_analyzers=excluded_analyzers)
                         issues_map[url] = issues
                         logger.debug(f"Scanned {url}: {len(issues)} issues ({elapsed:.2f}s)")
                     except Exception as e:
@@ -332,6 +395,12 @@ async def scan_site_enhanced(
                         except Exception:
                             pass
 
+                    if on_page:
+                        try:
+                            on_page(url, text, issues_map[url])
+                        except Exception as e:
+                            logger.warning(f"on_page callback failed for {url}: {e}")
+
                     # Persist if requested
                     if db_path:
                         try:
@@ -341,9 +410,7 @@ async def scan_site_enhanced(
                             logger.warning(f"Failed to save scan result: {e}")
 
                     # Discover links
-                    soup = BeautifulSoup(text, "lxml")
-                    for a in soup.find_all("a", href=True):
-                        href = a["href"]
+                    for href in _page_links(text):
                         full = urljoin(url, href)
 
                         # Clean URL (remove fragments)
@@ -351,7 +418,8 @@ async def scan_site_enhanced(
 
                         if not _same_domain(start_netloc, full):
                             continue
-                        if full not in seen and full not in [str(u) for u in list(to_visit._queue)]:
+                        if full not in seen and full not in queued:
+                            queued.add(full)
                             await to_visit.put(full)
                             total_found += 1
 
@@ -365,7 +433,11 @@ async def scan_site_enhanced(
         # Start workers
         logger.info(f"Starting {concurrency} workers, max {max_pages} pages")
         workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
-        await asyncio.gather(*workers)
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            if owns_pool:
+                analysis_pool.shutdown(cancel_futures=True)
 
         logger.info(f"Scan complete: {len(seen)} pages scanned")
 
@@ -378,8 +450,10 @@ def scan_site(
     concurrency: int = 10,
     delay: float = 0.0,
     db_path: Optional[str] = None,
-    exclude_analyzers: Optional[List[str]] = None,
+    exclude_analyzers: Optional[Iterable[str]] = None,
     rate_limit: float = 0.0,
+    on_page: Optional[Callable[[str, str, List[Dict[str, Any]]], None]] = None,
+    analysis_workers: int = 0,
 ) -> Dict[str, List[Dict]]:
     """Synchronous wrapper for scan_site_enhanced.
 
@@ -391,6 +465,8 @@ def scan_site(
         db_path: Optional database path to persist results
         exclude_analyzers: List of analyzer names to skip
         rate_limit: Maximum requests per second (0 = unlimited)
+        on_page: Optional callback (url, html, issues) for each fetched page
+        analysis_workers: Number of worker processes for page analysis (0 = none)
 
     Returns:
         Dictionary mapping URLs to lists of issues
@@ -404,5 +480,7 @@ def scan_site(
             db_path=db_path,
             exclude_analyzers=exclude_analyzers,
             rate_limit=rate_limit,
+            on_page=on_page,
+            analysis_workers=analysis_workers,
         )
     )
@@ -18,3 +18,71 @@ def test_detects_missing_alt_and_form_label():
     assert 'IMG_MISSING_ALT' in codes
     assert 'LINK_NO_TEXT' in codes
     assert 'FORM_CONTROL_NO_LABEL' in codes
+
+
+def test_legacy_fallback_detects_same_issues():
+    from ai.accessibility.analyzer import _legacy_analyze_html
+
+    html = """
+    <html>
+      <body>
+        <img src="logo.png" />
+        <a href="/"> </a>
+        <h1>Title</h1><h3>Skipped</h3>
+        <label for="email">Email</label><input type="email" id="email" />
+        <input type="text" id="name" />
+      </body>
+    </html>
+    """
+    issues = _legacy_analyze_html(html)
+    codes = [i['code'] for i in issues]
+    assert 'IMG_MISSING_ALT' in codes
+    assert 'LINK_NO_TEXT' in codes
+    assert 'HEADING_ORDER' in codes
+    assert codes.count('FORM_CONTROL_NO_LABEL') == 1
+
+
+def test_legacy_fallback_handles_framework_attributes():
+    from ai.accessibility.analyzer import _legacy_analyze_html
+
+    issues = _legacy_analyze_html('<img src="a.png" @click="open()" :class="{big: on}"><input x-model="q">')
+    contexts = {i['code']: i['context'] for i in issues}
+    assert contexts['IMG_MISSING_ALT'] == '<img src="a.png" @click="open()" :class="{big: on}">'
+    assert 'x-model="q"' in contexts['FORM_CONTROL_NO_LABEL']
+
+
+def test_version_info_matches_version():
+    from ai.accessibility.__version__ import __version__, __version_info__
+
+    assert __version_info__ == tuple(int(x) for x in __version__.split("."))
+
+
+def test_package_exports_resolve_lazily():
+    import ai.accessibility as pkg
+    from ai.accessibility import analyzer
+
+    assert pkg.analyze_html is analyzer.analyze_html
+    assert set(pkg.__all__) <= set(dir(pkg))
+
+
+def test_ai_suggestions_cached_per_prompt(monkeypatch):
+    from types import SimpleNamespace
+
+    from ai.accessibility import analyzer
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content=" use alt text ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    fake_openai = SimpleNamespace(api_key=None, ChatCompletion=SimpleNamespace(create=create))
+    monkeypatch.setattr(analyzer, "openai", fake_openai)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("SITEABLE_AI_CACHE_DIR", raising=False)
+
+    html = "<img src='cached-prompt.png'>"
+    assert analyzer.suggest_fixes_with_ai(html, []) == "use alt text"
+    assert analyzer.suggest_fixes_with_ai(html, []) == "use alt text"
+    assert len(calls) == 1
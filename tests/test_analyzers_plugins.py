@@ -41,3 +41,141 @@ def test_link_text_analyzer():
     analyzer = LinkTextAnalyzer()
     issues = analyzer.analyze(html)
     assert any(i['code'] == 'LINK_NO_TEXT' for i in issues)
+
+
+def test_plugin_analyze_html_sees_newly_registered_analyzer():
+    from ai.accessibility.analyzer_plugin import analyze_html, list_analyzers
+    from core.analyzer import Analyzer, get_registry
+
+    class DummyAnalyzer(Analyzer):
+        name = "dummy"
+        description = "Always reports one issue"
+
+        def analyze(self, html):
+            return [{"code": "DUMMY", "message": "dummy", "context": ""}]
+
+    list_analyzers()  # populate the cached analyzer list
+    registry = get_registry()
+    registry.register(DummyAnalyzer())
+    try:
+        assert "dummy" in list_analyzers()
+        assert any(i["code"] == "DUMMY" for i in analyze_html("<p></p>"))
+    finally:
+        registry.unregister("dummy")
+    assert "dummy" not in list_analyzers()
+
+
+def test_init_default_analyzers_is_idempotent():
+    from analyzers import ANALYZER_NAMES, init_default_analyzers
+    from core.analyzer import get_registry
+
+    init_default_analyzers()
+    registry = get_registry()
+    version = registry.version
+    first = registry.get("alt_text")
+
+    init_default_analyzers()
+    assert registry.version == version
+    assert registry.get("alt_text") is first
+    assert ANALYZER_NAMES <= set(registry.list())
+
+
+def test_tag_index_built_once_and_keeps_document_order():
+    from bs4 import BeautifulSoup
+
+    from core.analyzer import tag_index
+
+    soup = BeautifulSoup(
+        '<html><body><input id="a"><select id="b"></select><div role="main" style="x"></div>'
+        '<textarea id="c"></textarea></body></html>',
+        "lxml",
+    )
+    index = tag_index(soup)
+    assert tag_index(soup) is index
+    assert [el["id"] for el in index.tags("input", "textarea", "select")] == ["a", "b", "c"]
+    assert index.first("body") is soup.body
+    assert [el.name for el in index.with_role_value("main")] == ["div"]
+    assert index.ids["b"].name == "select"
+    assert index.text(soup.body) == soup.body.get_text(strip=True)
+
+
+def test_snippet_matches_truncated_markup():
+    from bs4 import BeautifulSoup
+
+    from analyzers.plugins import _snippet
+
+    soup = BeautifulSoup(
+        '<table class="a b"><tr><td>x &amp; y</td><td><img src="i.png"></td></tr>'
+        + "<tr><td>row</td></tr>" * 50 + "</table><p>short <!-- c --></p>",
+        "html.parser",
+    )
+    for el in soup.find_all(True):
+        for limit in (10, 50, 200, 10000):
+            assert _snippet(el, limit) == str(el)[:limit]
+
+
+def test_registry_iter_issues_streams_analyze_all_results():
+    from core.analyzer import AnalyzerRegistry
+
+    from analyzers.plugins import AltTextAnalyzer, FormLabelAnalyzer
+
+    registry = AnalyzerRegistry()
+    registry.register(AltTextAnalyzer())
+    registry.register(FormLabelAnalyzer())
+    html = '<html><body><img src="a.png"><input type="text"></body></html>'
+
+    stream = registry.iter_issues(html, exclude=["form_labels"])
+    assert next(stream)["code"] == "IMG_MISSING_ALT"
+    assert list(stream) == []
+    assert [i["code"] for i in registry.analyze_all(html)] == ["IMG_MISSING_ALT", "FORM_CONTROL_NO_LABEL"]
+
+
+def test_third_party_analyzers_get_raw_html(caplog):
+    from core.analyzer import Analyzer, AnalyzerRegistry
+
+    from analyzers.plugins import AltTextAnalyzer
+
+    class RawAnalyzer(Analyzer):
+        name = "raw"
+        description = "reads the page string"
+
+        def analyze(self, html):
+            return [{"code": "RAW", "message": html.lower()[:6], "context": ""}]
+
+    class BrokenAnalyzer(RawAnalyzer):
+        name = "broken"
+
+        def analyze(self, html):
+            raise RuntimeError("boom")
+
+    registry = AnalyzerRegistry()
+    for analyzer in (RawAnalyzer(), BrokenAnalyzer(), AltTextAnalyzer()):
+        registry.register(analyzer)
+    with caplog.at_level("WARNING", logger="siteable.analyzer"):
+        issues = registry.analyze_all('<HTML><body><img src="a.png"></body></HTML>')
+    assert [i["code"] for i in issues] == ["RAW", "IMG_MISSING_ALT"]
+    assert issues[0]["message"] == "<html>"
+    assert "broken" in caplog.text and "boom" in caplog.text
+
+
+def test_analyze_soup_defaults_to_analyze():
+    from bs4 import BeautifulSoup
+
+    from core.analyzer import Analyzer
+
+    from analyzers.plugins import AltTextAnalyzer
+
+    class RawAnalyzer(Analyzer):
+        name = "raw"
+        description = "reads the page string"
+
+        def analyze(self, html):
+            return [{"code": "RAW", "message": html, "context": ""}]
+
+    html = '<p>x</p>'
+    soup = BeautifulSoup(html, "lxml")
+    assert RawAnalyzer().analyze_soup(soup, html)[0]["message"] == html
+    assert RawAnalyzer().analyze_soup(soup)[0]["message"] == str(soup)
+
+    page = '<img src="a.png">'
+    assert AltTextAnalyzer().analyze_soup(BeautifulSoup(page, "lxml")) == AltTextAnalyzer().analyze(page)
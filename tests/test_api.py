@@ -78,3 +78,120 @@ def test_delete_scan_not_found(client):
     """Test deleting non-existent scan."""
     response = client.delete("/api/scan/nonexistent-id")
     assert response.status_code == 404
+
+
+def test_site_scan_awaits_crawler_and_reports_progress(monkeypatch):
+    """Site scans run the async crawler inside the server's event loop."""
+    import asyncio
+
+    import crawler.crawler_scanner as crawler_scanner
+    from api.routes import scan as scan_routes
+
+    shared_pool = object()
+    monkeypatch.setattr(scan_routes, "_get_analyze_pool", lambda: shared_pool)
+    calls = []
+
+    async def fake_scan_site_enhanced(url, on_progress=None, **kwargs):
+        calls.append(kwargs)
+        on_progress(1, 1, url)
+        return {url: [{"code": "IMG_MISSING_ALT", "message": "missing alt", "context": ""}]}
+
+    monkeypatch.setattr(crawler_scanner, "scan_site_enhanced", fake_scan_site_enhanced)
+    scan_id = "site-scan-test"
+    monkeypatch.setitem(scan_routes._scans, scan_id, {"scan_id": scan_id, "pages_scanned": 0})
+    request = scan_routes.ScanRequest(url="https://example.com", scan_site=True)
+
+    asyncio.run(scan_routes._run_scan(scan_id, request))
+
+    scan = scan_routes._scans[scan_id]
+    assert scan["status"] == "completed"
+    assert scan["pages_scanned"] == 1
+    assert scan["total_issues"] == 1
+    assert calls[0]["executor"] is shared_pool
+
+
+def test_single_page_scan_analyzes_in_worker_pool(monkeypatch):
+    """Single-page scans hand analysis to the shared process pool."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    import ai.accessibility.utils as utils
+    from api.routes import scan as scan_routes
+
+    monkeypatch.setattr(utils, "fetch_url", lambda url: '<html lang="en"><body><img src="a.png"></body></html>')
+    submitted = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(fn)
+            return super().submit(fn, *args, **kwargs)
+
+    pool = RecordingPool(max_workers=1)
+    monkeypatch.setattr(scan_routes, "_get_analyze_pool", lambda: pool)
+    scan_id = "single-scan-test"
+    monkeypatch.setitem(scan_routes._scans, scan_id, {"scan_id": scan_id, "pages_scanned": 0})
+
+    asyncio.run(scan_routes._run_scan(scan_id, scan_routes.ScanRequest(url="https://example.com")))
+    pool.shutdown()
+
+    scan = scan_routes._scans[scan_id]
+    assert scan["status"] == "completed"
+    assert submitted
+    assert any(i["code"] == "IMG_MISSING_ALT" for i in scan["results"]["issues"])
+
+
+def test_scan_store_evicts_oldest_finished_scans(monkeypatch):
+    """The in-memory store stays bounded without dropping running scans."""
+    from api.routes import scan as scan_routes
+
+    store = {
+        "old-done": {"status": "completed"},
+        "running": {"status": "running"},
+        "newer-done": {"status": "failed"},
+        "pending": {"status": "pending"},
+    }
+    monkeypatch.setattr(scan_routes, "_scans", store)
+    monkeypatch.setattr(scan_routes, "_MAX_SCANS", 2)
+
+    scan_routes._evict_finished_scans()
+
+    assert list(store) == ["running", "pending"]
+
+
+def test_api_keys_read_once(monkeypatch):
+    """API keys are parsed once; the cache is cleared explicitly on change."""
+    from api import auth
+
+    monkeypatch.delenv("SITEABLE_API_KEYS", raising=False)
+    auth.clear_api_keys()
+    # An empty key set is cached too, so auth-disabled requests skip the parse
+    assert auth.get_api_keys() == frozenset()
+    monkeypatch.setenv("SITEABLE_API_KEYS", " a, b ,,")
+    assert not auth.is_auth_enabled()
+    auth.clear_api_keys()
+    try:
+        assert auth.get_api_keys() == frozenset({"a", "b"})
+        monkeypatch.setenv("SITEABLE_API_KEYS", "c")
+        assert auth.get_api_keys() == frozenset({"a", "b"})
+        assert auth.is_auth_enabled()
+        assert auth._is_valid_key("a")
+        assert not auth._is_valid_key("c")
+        assert not auth._is_valid_key("ä")
+    finally:
+        monkeypatch.delenv("SITEABLE_API_KEYS")
+        auth.clear_api_keys()
+    assert not auth.is_auth_enabled()
+
+
+def test_shutdown_analyze_pool_stops_shared_pool(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from api.routes import scan as scan_routes
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(scan_routes, "_analyze_pool", pool)
+    scan_routes.shutdown_analyze_pool()
+    assert scan_routes._analyze_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "x")
+    scan_routes.shutdown_analyze_pool()
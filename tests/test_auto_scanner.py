@@ -0,0 +1,51 @@
+"""Test the simple synchronous site scanner."""
+
+import requests
+
+from ai.accessibility import auto_scanner
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+PAGES = {
+    "http://test.local/": "<html><body><img src='a.png'/><a href='/a'>A</a><a href='/b'>B</a>"
+    "<a href='http://other.local/'>Other</a></body></html>",
+    "http://test.local/a": "<html><body><img src='shared.png'/></body></html>",
+    "http://test.local/b": "<html><body><img src='shared.png'/></body></html>",
+}
+
+
+def _fake_get(self, url, **kwargs):
+    if url not in PAGES:
+        raise requests.HTTPError("404")
+    return _FakeResponse(PAGES[url])
+
+
+def test_scan_site_crawls_same_domain(monkeypatch):
+    monkeypatch.setattr(requests.Session, "get", _fake_get)
+    result = auto_scanner.scan_site("http://test.local/", max_pages=10, delay=0, concurrency=2)
+    assert set(result) == set(PAGES)
+    assert any(i["code"] == "IMG_MISSING_ALT" for i in result["http://test.local/a"])
+
+
+def test_scan_site_analyzes_identical_bodies_once(monkeypatch):
+    monkeypatch.setattr(requests.Session, "get", _fake_get)
+    calls = []
+    original = auto_scanner.analyze_html
+
+    def counting_analyze(html):
+        calls.append(html)
+        return original(html)
+
+    monkeypatch.setattr(auto_scanner, "analyze_html", counting_analyze)
+    result = auto_scanner.scan_site("http://test.local/", max_pages=10, delay=0)
+    assert len(result) == 3
+    assert len(calls) == 2
+    # Cached results are copies, not shared references
+    assert result["http://test.local/a"] is not result["http://test.local/b"]
@@ -0,0 +1,32 @@
+"""Test in-process caches."""
+
+from core.cache import LRUCache, content_digest
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_content_digest_is_stable():
+    assert content_digest("<p>x</p>") == content_digest("<p>x</p>")
+    assert content_digest("<p>x</p>") != content_digest("<p>y</p>")
+    assert len(content_digest("")) == 16
+
+
+def test_cached_plugin_results_are_not_shared():
+    from ai.accessibility.analyzer_plugin import analyze_html
+
+    html = '<html><body><img src="logo.png"/></body></html>'
+    first = analyze_html(html)
+    first[0]["code"] = "MUTATED"
+    second = analyze_html(html)
+    assert any(i["code"] == "IMG_MISSING_ALT" for i in second)
+    assert all(i["code"] != "MUTATED" for i in second)
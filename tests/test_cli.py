@@ -0,0 +1,88 @@
+import gzip
+import json
+
+from ai.accessibility.cli import main
+
+
+def test_json_output_gzipped_when_path_ends_in_gz(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text('<html><body><img src="a.png"></body></html>', encoding="utf-8")
+    out = tmp_path / "report.json.gz"
+
+    assert main(["--file", str(page), "--format", "json", "--output", str(out), "--quiet"]) == 0
+
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        report = json.load(f)
+    assert any(i["code"] == "IMG_MISSING_ALT" for i in report["issues"])
+
+
+def test_scan_site_apply_fixes_uses_crawled_html(tmp_path, monkeypatch):
+    import crawler.crawler_scanner as crawler_scanner
+
+    html = '<html><body><img src="a.png"></body></html>'
+    issues = [{"code": "IMG_MISSING_ALT", "message": "missing alt", "context": ""}]
+
+    def fake_scan_site(start_url, on_page=None, **kwargs):
+        on_page(start_url, html, issues)
+        on_page(start_url + "/copy", html, issues)
+        return {start_url: issues, start_url + "/copy": issues, start_url + "/missing": []}
+
+    monkeypatch.setattr(crawler_scanner, "scan_site", fake_scan_site)
+    out = tmp_path / "report.json"
+    outdir = tmp_path / "fixed"
+
+    rc = main([
+        "--url", "https://example.com", "--scan-site", "--apply-fixes",
+        "--outdir", str(outdir), "--format", "json", "--output", str(out), "--quiet",
+    ])
+
+    assert rc == 0
+    pages = json.loads(out.read_text(encoding="utf-8"))["pages"]
+    assert pages["https://example.com"]["fixed_fixes"]
+    assert "fixed_error" in pages["https://example.com/missing"]
+    assert 'alt=' in (outdir / "https_example.com.html").read_text(encoding="utf-8")
+    assert pages["https://example.com/copy"]["fixed_fixes"] == pages["https://example.com"]["fixed_fixes"]
+    assert (outdir / "https_example.com_copy.html").exists()
+
+
+def test_config_file_cached_until_modified(tmp_path):
+    import os
+
+    from ai.accessibility.cli import _load_config
+
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text('{"max_pages": 5}', encoding="utf-8")
+    assert _load_config(str(cfg)) == {"max_pages": 5}
+
+    cfg.write_text('{"max_pages": 7}', encoding="utf-8")
+    stat = cfg.stat()
+    os.utime(cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _load_config(str(cfg)) == {"max_pages": 7}
+
+
+def test_page_filename_keeps_query_variants_apart():
+    from ai.accessibility.cli import _page_filename
+
+    assert _page_filename("https://a.com/x") == "https_a.com_x.html"
+    first = _page_filename("https://a.com/list?page=1")
+    second = _page_filename("https://a.com/list?page=2")
+    assert first != second
+    assert "?" not in first and "=" not in first
+
+
+def test_json_output_same_bytes_without_orjson(tmp_path, monkeypatch, capsysbinary):
+    import ai.accessibility.cli as cli
+
+    report = {"url": "https://example.com/café", "issues": [{"message": "Plus d’informations", "n": 1}]}
+    outputs = []
+    for lib in (cli.orjson, None):
+        monkeypatch.setattr(cli, "orjson", lib)
+        for name in ("r.json", "r.json.gz"):
+            path = tmp_path / f"{lib is None}-{name}"
+            cli._emit_json(report, str(path))
+            raw = path.read_bytes()
+            outputs.append(gzip.decompress(raw) if name.endswith(".gz") else raw)
+        cli._emit_json(report)
+        outputs.append(capsysbinary.readouterr().out.rstrip(b"\n"))
+    assert len(set(outputs)) == 1
+    assert "café".encode("utf-8") in outputs[0]
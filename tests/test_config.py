@@ -0,0 +1,32 @@
+from core.config import Config
+
+
+def test_config_round_trip_ignores_unknown_keys_and_hides_api_key():
+    config = Config.from_dict({
+        "scan": {"concurrency": 3, "unknown": 1},
+        "analyzers": {"exclude": ["contrast"]},
+        "ai": {"enabled": True, "api_key": "secret"},
+        "extra": {},
+    })
+
+    assert config.scan.concurrency == 3
+    assert config.scan.max_pages == 200
+    assert config.ai.api_key == "secret"
+
+    data = config.to_dict()
+    assert data["analyzers"]["exclude"] == ["contrast"]
+    assert "api_key" not in data["ai"]
+    assert set(data) == {"scan", "analyzers", "output", "ai", "database"}
+    assert Config.from_dict(data).to_dict() == data
+
+
+def test_load_config_searches_current_directory_in_order(tmp_path, monkeypatch):
+    from core.config import load_config
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    assert load_config().scan.concurrency == 10
+
+    (tmp_path / "siteable.yml").mkdir()
+    (tmp_path / ".siteable.yml").write_text('{"scan": {"concurrency": 4}}', encoding="utf-8")
+    assert load_config().scan.concurrency == 4
@@ -66,3 +66,74 @@ def test_scan_site_enhanced_basic():
     assert 'http://test.local/about' in res
     # index should have IMG_MISSING_ALT
     assert any(i.get('code') == 'IMG_MISSING_ALT' for i in res['http://test.local/'])
+
+
+def _scan_with_mock(**kwargs):
+    transport = make_mock_transport()
+
+    async def run():
+        async with AsyncClient(transport=transport, base_url='http://test.local') as client:
+            import crawler.crawler_scanner as cs
+            original_async_client = cs.httpx.AsyncClient
+
+            class DummyAsyncClient:
+                def __init__(self, *args, **kw):
+                    self._client = client
+                async def __aenter__(self):
+                    return self._client
+                async def __aexit__(self, exc_type, exc, tb):
+                    return False
+
+            cs.httpx.AsyncClient = DummyAsyncClient
+            try:
+                return await scan_site_enhanced('http://test.local/', max_pages=10, concurrency=2, **kwargs)
+            finally:
+                cs.httpx.AsyncClient = original_async_client
+
+    return asyncio.run(run())
+
+
+def test_scan_site_enhanced_on_page_receives_html():
+    pages = {}
+    res = _scan_with_mock(on_page=lambda url, html, issues: pages.setdefault(url, (html, issues)))
+    assert set(pages) == set(res)
+    html, issues = pages['http://test.local/about']
+    assert '<h1>About</h1>' in html
+    assert issues == res['http://test.local/about']
+
+
+def test_scan_site_enhanced_analysis_workers_match_inline():
+    inline = _scan_with_mock()
+    pooled = _scan_with_mock(analysis_workers=2)
+    assert pooled == inline
+
+
+def test_scan_site_enhanced_leaves_given_executor_running():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        res = _scan_with_mock(executor=pool, analysis_workers=4)
+        assert res == _scan_with_mock()
+        # Still usable: the crawl did not shut down a pool it does not own
+        assert pool.submit(len, "abc").result() == 3
+
+
+def test_parse_robots_groups_by_user_agent():
+    from crawler.crawler_scanner import _parse_robots
+
+    groups = _parse_robots(
+        "# comment\nUser-agent: SiteAble\nDISALLOW: /a\nCrawl-delay: 2\n"
+        "user-agent: *\nDisallow:/b\nAllow: /c\nCrawl-delay: soon\nno colon here\n"
+    )
+    assert groups == [
+        {"user_agents": ["SiteAble"], "disallow": ["/a"], "crawl_delay": 2.0},
+        {"user_agents": ["*"], "disallow": ["/b"], "crawl_delay": None},
+    ]
+
+
+def test_page_links_in_document_order():
+    from crawler.crawler_scanner import _page_links
+
+    html = '<a href="/a">A</a><a name="x">no href</a><p><A HREF="/b?x=1&amp;y=2"></A></p><a href="">e</a>'
+    assert _page_links(html) == ["/a", "/b?x=1&y=2", ""]
+    assert _page_links("") == []
@@ -13,3 +13,60 @@ def test_apply_contrast_fix():
     fixed, applied = apply_fixes(html, [{'code': 'LOW_CONTRAST'}])
     assert 'color:' in fixed
     assert any(a['code'] == 'LOW_CONTRAST' for a in applied)
+
+
+def test_apply_fixes_only_for_reported_codes():
+    html = '<html><body><img src="/a.png"/><p style="color: #777777; background-color: #ffffff">t</p></body></html>'
+    fixed, applied = apply_fixes(html, [{'code': 'LOW_CONTRAST'}])
+    assert 'alt=' not in fixed
+    assert [a['code'] for a in applied] == ['LOW_CONTRAST']
+
+    fixed, applied = apply_fixes(html, [])
+    assert fixed == html
+    assert applied == []
+
+
+def test_apply_fixes_max_length_matches_full_prefix():
+    body = ''.join(f'<p>paragraph {i} é</p>' for i in range(2000))
+    html = f'<html><body><img src="/logo.png"/>{body}</body></html>'
+    full, _ = apply_fixes(html, [{'code': 'IMG_MISSING_ALT'}])
+    snippet, applied = apply_fixes(html, [{'code': 'IMG_MISSING_ALT'}], max_length=500)
+    assert snippet == full[:500]
+    assert applied
+
+
+def test_apply_fixes_keeps_content_around_root():
+    issues = [{'code': 'IMG_MISSING_ALT'}]
+    fixed, _ = apply_fixes('<!-- Site header comment --><html><body><img src="/a.png"></body></html>', issues)
+    assert fixed == '<!-- Site header comment --><html><body><img src="/a.png" alt="a.png"></body></html>'
+
+    html = '<?xml version="1.0" encoding="utf-8"?>\n<html><body><img src="/a.png"></body></html>'
+    fixed, _ = apply_fixes(html, issues)
+    assert fixed.startswith('<!--?xml version="1.0" encoding="utf-8"?-->')
+    assert 'DOCTYPE' not in fixed
+    assert 'alt="a.png"' in fixed
+
+
+def test_apply_fixes_max_length_is_prefix_with_prolog():
+    issues = [{'code': 'IMG_MISSING_ALT'}]
+    body = '<html><body><img src="/a.png"><p>é</p></body></html>'
+    for html in (
+        '<!-- Site header comment -->' + body,
+        '<?xml version="1.0" encoding="utf-8"?>\n' + body,
+        '﻿<!DOCTYPE html>' + body,
+        '<!-- c --><!DOCTYPE html>' + body,
+        body,
+    ):
+        full, _ = apply_fixes(html, issues)
+        for n in (1, 10, 40, 200):
+            assert apply_fixes(html, issues, max_length=n)[0] == full[:n]
+    assert apply_fixes('﻿<!DOCTYPE html>' + body, issues)[0].startswith('<!DOCTYPE html>')
+
+
+def test_apply_fixes_handles_framework_attributes():
+    html = ('<html><body><img src="/a.png" @click="zoom()">'
+            '<p :class="{on: x}" style="color: #777777; background-color: #ffffff">t</p></body></html>')
+    fixed, applied = apply_fixes(html, [{'code': 'IMG_MISSING_ALT'}, {'code': 'LOW_CONTRAST'}])
+    assert [a['code'] for a in applied] == ['IMG_MISSING_ALT', 'LOW_CONTRAST']
+    assert applied[0]['context'] == '<img src="/a.png" @click="zoom()" alt="a.png">'
+    assert '@click="zoom()"' in fixed and ':class="{on: x}"' in fixed
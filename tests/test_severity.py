@@ -123,3 +123,30 @@ def test_get_severity_emoji():
     assert get_severity_emoji(CRITICAL) == "🔴"
     assert get_severity_emoji(MAJOR) == "🟡"
     assert get_severity_emoji(MINOR) == "🔵"
+
+
+def test_severity_map_is_read_only():
+    from core.severity import SEVERITY_MAP
+
+    with pytest.raises(TypeError):
+        SEVERITY_MAP["NEW_CODE"] = {"level": "minor"}
+    with pytest.raises(TypeError):
+        SEVERITY_MAP["IMG_MISSING_ALT"]["level"] = "minor"
+
+
+def test_enrich_and_summarize_matches_separate_passes():
+    from core.severity import enrich_and_summarize
+
+    issues = [
+        {"code": "HEADING_ORDER"},
+        {"code": "IMG_MISSING_ALT"},
+        {"code": "UNKNOWN_CODE"},
+        {"code": "LOW_CONTRAST"},
+        {"message": "no code"},
+    ]
+    enriched, counts = enrich_and_summarize(issues)
+    assert enriched == enrich_issues(issues)
+    assert counts == summarize_by_severity(enriched)
+    assert sort_by_severity(enriched) == sorted(
+        enriched, key=lambda i: {CRITICAL: 0, MAJOR: 1, MINOR: 2}[i["severity"]]
+    )